@@ -0,0 +1,79 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+class AdaptivePageSize:
+    """The page size of a paginated query, which is halved when a page
+    is too expensive for GitHub to serve (exceeding its resource limits
+    or timing out), and doubled again after consecutive successful pages,
+    up to the maximum.
+    """
+
+    __slots__ = [
+        '_size',
+        '_minimum',
+        '_maximum',
+        '_growAfter',
+        '_successes'
+        ]
+
+    def __init__(self, maximum=100, minimum=1, growAfter=2):
+        """Initializes the page size at its maximum.
+
+        Keyword arguments:
+        maximum - The maximum page size, which for GitHub's GraphQL API is 100.
+        minimum - The minimum page size.
+        growAfter - The number of consecutive successful pages after which
+            the page size is doubled.
+        """
+        self._size = maximum
+        self._minimum = minimum
+        self._maximum = maximum
+        self._growAfter = growAfter
+        self._successes = 0
+
+    def size(self):
+        """Gets the current page size."""
+        return self._size
+
+    def shrink(self):
+        """Halves the page size after a failed page, returning True, or
+        returns False if the page size is already at its minimum.
+        """
+        self._successes = 0
+        if self._size <= self._minimum:
+            return False
+        self._size = max(self._minimum, self._size // 2)
+        return True
+
+    def grow(self):
+        """Records a successful page, doubling the page size if enough
+        consecutive pages have succeeded.
+        """
+        self._successes += 1
+        if self._successes >= self._growAfter and self._size < self._maximum:
+            self._size = min(self._maximum, 2 * self._size)
+            self._successes = 0
@@ -0,0 +1,348 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import gzip
+import http.client
+import json
+import os
+import threading
+from urllib.parse import urlencode, urlsplit
+from RetryPolicy import RetryPolicy, TransientError, transientStatusError, hasTransientErrors, hasExpensiveQueryErrors
+from AdaptivePageSize import AdaptivePageSize
+
+class GitHubClient:
+    """An in-process client for GitHub's GraphQL and REST APIs. Persistent
+    (keep-alive) connections are kept in a pool shared by all threads, from
+    which each request checks out an idle connection and to which it returns
+    it, so after the first requests, each query costs a single request
+    round-trip no matter which thread sends it. Call close() to close the
+    pooled connections once the client is no longer needed.
+    """
+
+    __slots__ = [
+        '_token',
+        '_apiUrl',
+        '_graphqlUrl',
+        '_timeout',
+        '_idle',
+        '_lock',
+        '_rateLimiter',
+        '_retryPolicy'
+        ]
+
+    def __init__(
+        self,
+        token,
+        apiUrl="https://api.github.com",
+        graphqlUrl=None,
+        timeout=30,
+        rateLimiter=None,
+        retryPolicy=None):
+        """Initializes the client.
+
+        Keyword arguments:
+        token - The token for authenticating with the GitHub API.
+        apiUrl - The base url of GitHub's REST API.
+        graphqlUrl - The url of GitHub's GraphQL endpoint. If None, it
+            is derived from apiUrl.
+        timeout - The timeout, in seconds, for each request.
+        rateLimiter - If not None, a RateLimiter that paces the requests
+            and records the rate limits of the responses.
+        retryPolicy - The RetryPolicy for requests that fail with transient
+            errors, or None for the default policy.
+        """
+        self._token = token
+        self._apiUrl = urlsplit(apiUrl.rstrip("/"))
+        self._graphqlUrl = urlsplit(
+            graphqlUrl if graphqlUrl != None else apiUrl.rstrip("/") + "/graphql")
+        self._timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._rateLimiter = rateLimiter
+        self._retryPolicy = retryPolicy if retryPolicy != None else RetryPolicy()
+
+    @classmethod
+    def fromEnvironment(cls, rateLimiter=None, retryPolicy=None):
+        """Creates a client configured from the environment variables
+        of the GitHub Actions runner, or returns None if there is no
+        GITHUB_TOKEN available.
+
+        Keyword arguments:
+        rateLimiter - If not None, a RateLimiter that paces the requests
+            and records the rate limits of the responses.
+        retryPolicy - The RetryPolicy for requests that fail with transient
+            errors, or None for the default policy.
+        """
+        token = os.environ.get("GITHUB_TOKEN", "").strip()
+        if len(token) == 0:
+            return None
+        return cls(
+            token,
+            os.environ.get("GITHUB_API_URL", "https://api.github.com"),
+            os.environ.get("GITHUB_GRAPHQL_URL"),
+            rateLimiter=rateLimiter,
+            retryPolicy=retryPolicy
+            )
+
+    def graphql(self, query, variables, needsPagination=False):
+        """Executes a GraphQL query. Returns the parsed response, or
+        if needsPagination is True, a list of the parsed responses of
+        all of the pages, in the same format as gh api graphql --paginate.
+        Requests that fail with transient errors are retried, and
+        TransientError is raised if the retry policy's budget runs out.
+
+        Keyword arguments:
+        query - The query as a string.
+        variables - A dictionary of the query's variables.
+        needsPagination - Pass True to follow pageInfo.endCursor through
+            all pages of results. The query must declare an $endCursor variable.
+        """
+        if not needsPagination:
+            return self._graphqlPage(query, variables)
+        return list(self.graphqlPages(query, variables))
+
+    def graphqlPages(self, query, variables):
+        """Executes a paginated GraphQL query, following pageInfo.endCursor,
+        and yields each parsed page as soon as it arrives. Stops after a page
+        with errors. Raises TransientError if a request can't be completed
+        within the retry policy's budget. If the query declares a $pageSize
+        variable, the page size adapts: a page that is too expensive is retried
+        from the same cursor with a smaller page size, which grows again after
+        successful pages.
+
+        Keyword arguments:
+        query - The query as a string. It must declare an $endCursor variable.
+        variables - A dictionary of the query's variables.
+        """
+        variables = dict(variables)
+        pageSize = AdaptivePageSize() if "$pageSize" in query else None
+        while True:
+            page = self._graphqlPage(query, variables, pageSize)
+            yield page
+            pageInfo = findPageInfo(page.get("data"))
+            if ("errors" in page or pageInfo == None or
+                not pageInfo.get("hasNextPage")):
+                return
+            variables["endCursor"] = pageInfo["endCursor"]
+            if pageSize != None:
+                pageSize.grow()
+
+    def close(self):
+        """Closes the idle connections of the pool. The client may still be
+        used afterwards, in which case it opens new connections.
+        """
+        with self._lock:
+            idle = [connection for connections in self._idle.values() for connection in connections]
+            self._idle.clear()
+        for connection in idle:
+            connection.close()
+
+    def rest(self, path, parameters):
+        """Executes a GET request to the REST API and returns the
+        parsed response. Raises TransientError if the request can't be
+        completed within the retry policy's budget.
+
+        Keyword arguments:
+        path - The path of the endpoint relative to the api url, such
+            as search/commits.
+        parameters - A dictionary of the query string parameters.
+        """
+        return self.restConditional(path, parameters)[2]
+
+    def restConditional(self, path, parameters, etag=None):
+        """Executes a GET request to the REST API, revalidating with
+        If-None-Match if an etag is given. Returns a tuple with the
+        status code, the ETag of the response (or None), and the parsed
+        response (None if the status is 304 Not Modified). Raises
+        TransientError if the request can't be completed within the retry
+        policy's budget.
+
+        Keyword arguments:
+        path - The path of the endpoint relative to the api url, such
+            as search/commits.
+        parameters - A dictionary of the query string parameters.
+        etag - The ETag of a previously cached response, or None.
+        """
+        url = "{0}/{1}?{2}".format(
+            self._apiUrl.path,
+            path.lstrip("/"),
+            urlencode(parameters))
+        extraHeaders = {"If-None-Match" : etag} if etag != None else None
+        resource = "search" if path.lstrip("/").startswith("search/") else "core"
+        def attempt():
+            if self._rateLimiter != None:
+                self._rateLimiter.acquire(resource)
+            status, headers, body = self._request(
+                self._apiUrl, "GET", url, None, extraHeaders)
+            if self._rateLimiter != None:
+                self._rateLimiter.recordHeaders(headers, resource)
+            error = transientStatusError(status, headers, body)
+            if error != None:
+                raise error
+            return status, headers, body
+        status, headers, body = self._retryPolicy.run(attempt)
+        if status == 304:
+            return status, headers.get("etag", etag), None
+        return status, headers.get("etag"), json.loads(body)
+
+    def _graphqlPage(self, query, variables, pageSize=None):
+        """Executes a single GraphQL request and returns the parsed response.
+
+        Keyword arguments:
+        query - The query as a string.
+        variables - A dictionary of the query's variables.
+        pageSize - An AdaptivePageSize for the query's $pageSize variable,
+            which shrinks if the page is too expensive, or None.
+        """
+        def tooExpensive(error):
+            # Retries a page that was too expensive right away with a
+            # smaller page size, if it can still shrink.
+            if pageSize != None and pageSize.shrink():
+                return TransientError(
+                    f"{error}; reducing the page size to {pageSize.size()}",
+                    retryAfter=0,
+                    result=error.result)
+            return error
+        def attempt():
+            if pageSize != None:
+                variables["pageSize"] = pageSize.size()
+            body = json.dumps({"query" : query, "variables" : variables}).encode("utf-8")
+            if self._rateLimiter != None:
+                self._rateLimiter.acquire("graphql")
+            try:
+                status, headers, text = self._request(
+                    self._graphqlUrl,
+                    "POST",
+                    self._graphqlUrl.path,
+                    body)
+            except TransientError as e:
+                if isinstance(e.__cause__, TimeoutError):
+                    raise tooExpensive(e) from e
+                raise
+            error = transientStatusError(status, headers, text)
+            if error != None:
+                raise tooExpensive(error) if status in {502, 504} else error
+            result = json.loads(text)
+            if self._rateLimiter != None:
+                self._rateLimiter.recordGraphQL(result)
+            if pageSize != None and hasExpensiveQueryErrors(result):
+                error = tooExpensive(TransientError("GraphQL query was too expensive", result=result))
+                if error.retryAfter != None:
+                    raise error
+            if hasTransientErrors(result):
+                raise TransientError("GraphQL query failed with transient errors", result=result)
+            return result
+        return self._retryPolicy.run(attempt)
+
+    def _request(self, url, method, path, body, extraHeaders=None):
+        """Sends a request on a persistent connection from the pool,
+        reconnecting once if the server closed an idle connection.
+        Returns a tuple with the status code, a dictionary of the
+        response headers (with lowercase names), and the decoded
+        response body. Raises TransientError if the request fails
+        due to a network error or timeout.
+
+        Keyword arguments:
+        url - The parsed url of the host.
+        method - The HTTP method.
+        path - The path, including any query string.
+        body - The request body as bytes, or None.
+        extraHeaders - A dictionary of any additional request headers.
+        """
+        headers = {
+            "Authorization" : "bearer " + self._token,
+            "Accept" : "application/vnd.github+json",
+            "Accept-Encoding" : "gzip",
+            "User-Agent" : "user-statistician"
+            }
+        if body != None:
+            headers["Content-Type"] = "application/json"
+        if extraHeaders != None:
+            headers.update(extraHeaders)
+        for attempt in range(2):
+            connection = self._checkOut(url)
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                connection.close()
+                if attempt == 1:
+                    raise TransientError(f"Connection failed ({e})") from e
+                continue
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                raise TransientError(f"Request failed ({e})") from e
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkIn(url, connection)
+            responseHeaders = {k.lower() : v for k, v in response.getheaders()}
+            if responseHeaders.get("content-encoding", "").lower() == "gzip":
+                data = gzip.decompress(data)
+            return response.status, responseHeaders, data.decode("utf-8")
+
+    def _checkOut(self, url):
+        """Checks out an idle connection to the host of a url from the
+        pool, or opens a new one if there are none.
+
+        Keyword arguments:
+        url - The parsed url of the host.
+        """
+        with self._lock:
+            idle = self._idle.get((url.scheme, url.netloc))
+            if idle:
+                return idle.pop()
+        if url.scheme == "http":
+            return http.client.HTTPConnection(url.netloc, timeout=self._timeout)
+        return http.client.HTTPSConnection(url.netloc, timeout=self._timeout)
+
+    def _checkIn(self, url, connection):
+        """Returns a connection to the pool of idle connections.
+
+        Keyword arguments:
+        url - The parsed url of the host.
+        connection - The connection, whose response has been read.
+        """
+        with self._lock:
+            self._idle.setdefault((url.scheme, url.netloc), []).append(connection)
+
+def findPageInfo(data):
+    """Finds the pageInfo object of the paginated connection within
+    the data of a GraphQL response, or returns None if there isn't one.
+
+    Keyword arguments:
+    data - The data field of a GraphQL response.
+    """
+    if isinstance(data, dict):
+        if "pageInfo" in data:
+            return data["pageInfo"]
+        for value in data.values():
+            pageInfo = findPageInfo(value)
+            if pageInfo != None:
+                return pageInfo
+    return None
@@ -0,0 +1,86 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+_rateLimitSelection = """  rateLimit {
+    cost
+    remaining
+    resetAt
+  }
+"""
+
+def combineQueries(queries):
+    """Combines several queries of the form query($owner: String!) { user(login: $owner) {...} }
+    into a single query, in which each query's selection of the user's fields
+    is aliased by the query's name.
+
+    Keyword arguments:
+    queries - A list of tuples of the names and texts of the queries.
+    """
+    selections = [
+        "  {0}: user(login: $owner) {1}\n".format(name, extractUserSelection(query))
+        for name, query in queries ]
+    return "query($owner: String!) {\n" + _rateLimitSelection + "".join(selections) + "}\n"
+
+def extractUserSelection(query):
+    """Extracts the selection set of the user field from a query, including
+    its enclosing braces.
+
+    Keyword arguments:
+    query - The text of the query.
+    """
+    start = query.index("{", query.index("user(login: $owner)"))
+    depth = 0
+    for i in range(start, len(query)):
+        if query[i] == "{":
+            depth += 1
+        elif query[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return query[start:i+1]
+    raise ValueError("Unbalanced braces in query")
+
+def splitCombinedResult(result, names):
+    """Splits the result of a combined query into results in the form
+    of the results of the individual queries.
+
+    Keyword arguments:
+    result - The parsed result of the combined query.
+    names - The names of the queries that were combined.
+    """
+    return { name : {"data" : {"user" : result["data"][name]}} for name in names }
+
+def isCompleteCombinedResult(result, names):
+    """Checks if the result of a combined query has no errors, and has
+    data for every one of the queries that were combined.
+
+    Keyword arguments:
+    result - The parsed result of the combined query, or None.
+    names - The names of the queries that were combined.
+    """
+    return (isinstance(result, dict) and "errors" not in result and
+            isinstance(result.get("data"), dict) and
+            all(result["data"].get(name) != None for name in names))
@@ -0,0 +1,140 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from StatConfig import categoryOrder, statsByCategory
+
+class QueryPlan:
+    """Determines which queries, and which fields of the repository
+    queries, are needed for the stats that the card displays, given
+    the order of the categories and the excluded keys, so that stats
+    that won't be displayed are never queried.
+    """
+
+    __slots__ = [
+        '_displayed'
+        ]
+
+    def __init__(self, categories=categoryOrder, exclude=set()):
+        """Initializes the plan.
+
+        Keyword arguments:
+        categories - The list of the keys of the categories on the card.
+        exclude - A set of the keys of categories and stats to exclude.
+        """
+        self._displayed = set()
+        for category in categories:
+            if category in statsByCategory and category not in exclude:
+                self._displayed.add(category)
+                self._displayed.update(
+                    key for key in statsByCategory[category] if key not in exclude)
+
+    def isDisplayed(self, key):
+        """Checks whether a category or stat may be displayed.
+
+        Keyword arguments:
+        key - The key of a category or stat.
+        """
+        return key in self._displayed
+
+    def needsContributions(self):
+        """Checks whether the contributions query is needed."""
+        return any(self.isDisplayed(key) for key in ["commits", "issues", "prs", "reviews", "private"])
+
+    def needsContributedTo(self):
+        """Checks whether the query of the repositories contributed to is needed."""
+        return self.isDisplayed("contribTo")
+
+    def needsYearlyContributions(self):
+        """Checks whether the queries of each year of contributions are needed."""
+        return any(self.isDisplayed(key) for key in ["commits", "reviews", "private"])
+
+    def needsTotalCommits(self):
+        """Checks whether the search for the total number of commits is needed."""
+        return self.isDisplayed("commits")
+
+    def needsTotalReviews(self):
+        """Checks whether the search for the total number of pull request reviews is needed."""
+        return self.isDisplayed("reviews")
+
+    def needsLanguages(self):
+        """Checks whether the languages of the repositories are needed."""
+        return self.isDisplayed("languages")
+
+    def needsWatchers(self):
+        """Checks whether the watchers of the repositories are needed."""
+        return self.isDisplayed("watchedBy")
+
+    def needsRepositories(self):
+        """Checks whether the repository query is needed."""
+        return self.needsLanguages() or any(
+            self.isDisplayed(key) for key in ["mostStarred", "mostForked"] + statsByCategory["repositories"])
+
+    def repoStatsQuery(self, query):
+        """Removes the fields of the repositories that the card doesn't need
+        from a repository query.
+
+        Keyword arguments:
+        query - The text of the query.
+        """
+        if not self.needsWatchers():
+            query = removeField(query, "watchers")
+        if not self.needsLanguages():
+            query = removeField(query, "languages")
+        return query
+
+def removeField(query, field):
+    """Removes the first occurrence of a field, including its arguments
+    and selection set, from the text of a query. The field must begin
+    its own line.
+
+    Keyword arguments:
+    query - The text of the query.
+    field - The name of the field.
+    """
+    start = 0
+    while True:
+        start = query.index("\n", start) + 1
+        if query[start:].lstrip(" ").startswith(field):
+            break
+    # Braces within the arguments, such as orderBy, are skipped.
+    depth = 0
+    parentheses = 0
+    for i in range(start, len(query)):
+        if query[i] == "(":
+            parentheses += 1
+        elif query[i] == ")":
+            parentheses -= 1
+        elif parentheses > 0:
+            continue
+        elif query[i] == "{":
+            depth += 1
+        elif query[i] == "}":
+            depth -= 1
+            if depth == 0:
+                end = query.find("\n", i)
+                return query[:start] + query[end + 1 if end >= 0 else len(query):]
+    raise ValueError("Unbalanced braces in query")
@@ -0,0 +1,179 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import threading
+import time
+from datetime import datetime
+
+class RateLimiter:
+    """Tracks the remaining rate limit budget of each of GitHub's API
+    resources (e.g., graphql and search) from the responses to queries,
+    along with the points the queries have consumed. Before each request,
+    it paces requests once the remaining budget falls to a reserve, and
+    defers them until the reset time if the budget is exhausted. Safe to
+    share among threads, and among the cards of a batch that use one token.
+    """
+
+    __slots__ = [
+        '_lock',
+        '_budgets',
+        '_consumed',
+        '_reserve',
+        '_maxWait',
+        '_sleep'
+        ]
+
+    def __init__(self, reserve=None, maxWait=900, sleep=time.sleep):
+        """Initializes the rate limiter.
+
+        Keyword arguments:
+        reserve - A dictionary mapping resource names to the remaining
+            budget at which to start pacing requests, or None for defaults.
+        maxWait - The maximum number of seconds to wait before a request.
+            If the rate limit won't reset by then, the request is sent anyway.
+        sleep - The function to call to wait a number of seconds.
+        """
+        self._lock = threading.Lock()
+        self._budgets = {}
+        self._consumed = {}
+        self._reserve = reserve if reserve != None else {
+            "graphql" : 100,
+            "search" : 3,
+            "core" : 50
+        }
+        self._maxWait = maxWait
+        self._sleep = sleep
+
+    def acquire(self, resource, cost=1):
+        """Waits, if necessary, until a request to a resource fits the
+        remaining budget, and then reserves its expected cost until the
+        actual remaining budget is known from the response.
+
+        Keyword arguments:
+        resource - The name of the resource, such as graphql or search.
+        cost - The expected cost of the request.
+        """
+        with self._lock:
+            budget = self._budgets.get(resource)
+            if budget == None:
+                return
+            remaining = budget["remaining"]
+            secondsToReset = max(0, budget["resetAt"] - time.time())
+            if remaining >= self._reserve.get(resource, 0) + cost:
+                delay = 0
+            elif remaining < cost:
+                # Exhausted, so defer until the budget resets.
+                delay = secondsToReset
+            else:
+                # Spread the rest of the budget evenly until the reset.
+                delay = secondsToReset * cost / remaining
+            budget["remaining"] = remaining - cost
+        if delay > self._maxWait:
+            print(f"WARNING: The {resource} rate limit won't reset for {round(delay)} seconds.")
+        elif delay > 0:
+            self._sleep(delay)
+
+    def record(self, resource, remaining, resetAt, cost=1):
+        """Records the remaining budget of a resource after a request.
+
+        Keyword arguments:
+        resource - The name of the resource, such as graphql or search.
+        remaining - The remaining budget.
+        resetAt - The time, in seconds since the epoch, when the budget resets.
+        cost - The cost of the request.
+        """
+        with self._lock:
+            self._budgets[resource] = {"remaining" : remaining, "resetAt" : resetAt}
+            self._consumed[resource] = self._consumed.get(resource, 0) + cost
+
+    def recordCost(self, resource, cost=1):
+        """Records the cost of a request whose response didn't include
+        the remaining budget.
+
+        Keyword arguments:
+        resource - The name of the resource, such as graphql or search.
+        cost - The cost of the request.
+        """
+        with self._lock:
+            self._consumed[resource] = self._consumed.get(resource, 0) + cost
+
+    def recordGraphQL(self, result):
+        """Records the rate limit of a GraphQL response, if it requested
+        rateLimit { cost remaining resetAt }.
+
+        Keyword arguments:
+        result - The parsed response to a GraphQL query.
+        """
+        data = result.get("data") if isinstance(result, dict) else None
+        if isinstance(data, dict) and isinstance(data.get("rateLimit"), dict):
+            rateLimit = data["rateLimit"]
+            self.record(
+                "graphql",
+                rateLimit["remaining"],
+                parseTimestamp(rateLimit["resetAt"]),
+                rateLimit["cost"])
+
+    def recordHeaders(self, headers, resource="core"):
+        """Records the rate limit from the headers of a REST API response.
+
+        Keyword arguments:
+        headers - A dictionary of the response headers, with lowercase names.
+        resource - The resource to assume if the headers don't specify it.
+        """
+        if "x-ratelimit-remaining" in headers and "x-ratelimit-reset" in headers:
+            self.record(
+                headers.get("x-ratelimit-resource", resource),
+                int(headers["x-ratelimit-remaining"]),
+                int(headers["x-ratelimit-reset"]))
+
+    def consumed(self):
+        """Gets a dictionary of the points consumed by resource."""
+        with self._lock:
+            return dict(self._consumed)
+
+    def report(self):
+        """Logs the points consumed and remaining budget of each resource."""
+        with self._lock:
+            for resource, consumed in sorted(self._consumed.items()):
+                budget = self._budgets.get(resource)
+                if budget == None:
+                    print(f"Rate limit ({resource}): {consumed} points used.")
+                    continue
+                print("Rate limit ({0}): {1} points used, {2} remaining, resets at {3}.".format(
+                    resource,
+                    consumed,
+                    budget["remaining"],
+                    time.strftime("%H:%M:%S UTC", time.gmtime(budget["resetAt"]))))
+
+def parseTimestamp(timestamp):
+    """Converts an ISO 8601 timestamp, as used by GitHub's GraphQL API,
+    to seconds since the epoch.
+
+    Keyword arguments:
+    timestamp - The timestamp, such as 2026-07-22T12:00:00Z.
+    """
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
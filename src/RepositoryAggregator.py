@@ -0,0 +1,210 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+class RepositoryAggregator:
+    """Computes the repository and language stats in a single pass
+    over the owned repositories. Pages of repositories can be added
+    one at a time as they arrive, so that the results of the query
+    never need to be held in memory all at once.
+    """
+
+    __slots__ = [
+        '_languageRepoExclusions',
+        '_totalCount',
+        '_stargazers',
+        '_stargazersAll',
+        '_forks',
+        '_forksAll',
+        '_watchers',
+        '_watchersAll',
+        '_private',
+        '_privateOrFork',
+        '_archived',
+        '_archivedAll',
+        '_templates',
+        '_templatesAll',
+        '_mostStarred',
+        '_mostForked',
+        '_languageTotalSize',
+        '_languageData'
+        ]
+
+    def __init__(self, languageRepoExclusions=set()):
+        """Initializes the aggregator.
+
+        Keyword arguments:
+        languageRepoExclusions - A set of repositories (lowercase names) to
+            exclude from language stats.
+        """
+        self._languageRepoExclusions = languageRepoExclusions
+        self._totalCount = None
+        self._stargazers = 0
+        self._stargazersAll = 0
+        self._forks = 0
+        self._forksAll = 0
+        self._watchers = 0
+        self._watchersAll = 0
+        self._private = 0
+        self._privateOrFork = 0
+        self._archived = 0
+        self._archivedAll = 0
+        self._templates = 0
+        self._templatesAll = 0
+        self._mostStarred = None
+        self._mostForked = None
+        self._languageTotalSize = 0
+        self._languageData = {}
+
+    def addPage(self, page):
+        """Adds a page of the results of the repo stats query,
+        of either a user or an organization.
+
+        Keyword arguments:
+        page - One page of the results of the repo stats query.
+        """
+        data = page["data"]
+        owner = data["user"] if "user" in data else data["organization"]
+        self.addRepositories(owner["repositories"])
+
+    def addRepositories(self, repositories):
+        """Adds a page of a repositories connection. The total count
+        of owned repositories is taken from the first page.
+
+        Keyword arguments:
+        repositories - A repositories connection with totalCount and nodes.
+        """
+        if self._totalCount == None:
+            self._totalCount = repositories["totalCount"]
+        # The "nodes" field is nullable.
+        if repositories["nodes"] != None:
+            for repo in repositories["nodes"]:
+                self.addRepository(repo)
+
+    def addRepository(self, repo):
+        """Adds one repository to all of the counts.
+
+        Keyword arguments:
+        repo - A repository node of the repo stats query. The watchers
+            and languages fields may be omitted if not needed.
+        """
+        if repo["isPrivate"]:
+            self._private += 1
+            self._privateOrFork += 1
+            return
+        stars = repo["stargazerCount"]
+        forks = repo["forkCount"]
+        watchers = repo["watchers"]["totalCount"] if "watchers" in repo else 0
+        self._stargazersAll += stars
+        self._forksAll += forks
+        self._watchersAll += watchers
+        if repo["isArchived"]:
+            self._archivedAll += 1
+        if repo["isTemplate"]:
+            self._templatesAll += 1
+        if repo["isFork"]:
+            self._privateOrFork += 1
+            return
+        self._stargazers += stars
+        self._forks += forks
+        self._watchers += watchers
+        if repo["isArchived"]:
+            self._archived += 1
+        if repo["isTemplate"]:
+            self._templates += 1
+        # Strict comparisons keep the first of any ties, as max() does.
+        if self._mostStarred == None or stars > self._mostStarred["stargazerCount"]:
+            self._mostStarred = repo
+        if self._mostForked == None or forks > self._mostForked["forkCount"]:
+            self._mostForked = repo
+        if "languages" in repo and repo["name"].lower() not in self._languageRepoExclusions:
+            self._languageTotalSize += repo["languages"]["totalSize"]
+            if repo["languages"]["edges"] != None:
+                for L in repo["languages"]["edges"]:
+                    name = L["node"]["name"]
+                    if name in self._languageData:
+                        self._languageData[name]["size"] += L["size"]
+                    else:
+                        self._languageData[name] = {
+                            "color" : L["node"]["color"],
+                            "size" : L["size"]
+                            }
+
+    def hasRepositories(self):
+        """Checks whether the owner owns at least one repository."""
+        return self._totalCount != None and self._totalCount > 0
+
+    def repoStats(self):
+        """Gets the repository stats, in the form of Statistician's
+        repositories category, with non-forks then all public repositories.
+        """
+        if not self.hasRepositories():
+            return {
+                "public" : [0, 0],
+                "starredBy" : [0, 0],
+                "forkedBy" : [0, 0],
+                "watchedBy" : [0, 0],
+                "archived" : [0, 0],
+                "templates" : [0, 0]
+            }
+        return {
+            "public" : [
+                self._totalCount - self._privateOrFork,
+                self._totalCount - self._private],
+            "starredBy" : [self._stargazers, self._stargazersAll],
+            "forkedBy" : [self._forks, self._forksAll],
+            "watchedBy" : [self._watchers, self._watchersAll],
+            "archived" : [self._archived, self._archivedAll],
+            "templates" : [self._templates, self._templatesAll]
+        }
+
+    def mostStarred(self):
+        """Gets the name of the public non-fork with the most stars,
+        or None if there isn't one.
+        """
+        if not self.hasRepositories() or self._mostStarred == None:
+            return None
+        return self._mostStarred["name"]
+
+    def mostForked(self):
+        """Gets the name of the public non-fork with the most forks,
+        or None if there isn't one.
+        """
+        if not self.hasRepositories() or self._mostForked == None:
+            return None
+        return self._mostForked["name"]
+
+    def languageSummary(self):
+        """Gets the language distribution of the public non-forks,
+        excluding those in the language exclusions, as a tuple with the
+        total size and a dictionary mapping each language to its color,
+        size, and percentage.
+        """
+        if not self.hasRepositories():
+            return 0, {}
+        for L in self._languageData.values():
+            L["percentage"] = L["size"] / self._languageTotalSize
+        return self._languageTotalSize, self._languageData
@@ -0,0 +1,137 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import time
+
+class RepositorySnapshot:
+    """A snapshot of the owned repositories (stars, forks, watchers,
+    flags, and language sizes) from a previous run, which can be brought
+    up to date from the pages of a query of the repositories ordered by
+    most recently updated first. Updating stops at the first repository
+    that hasn't changed since the snapshot, since all repositories after
+    it in that order are also unchanged. The snapshot records the time
+    of its last full refresh, which incremental updates carry forward.
+    """
+
+    __slots__ = [
+        '_totalCount',
+        '_repos',
+        '_isIncremental',
+        '_refreshed'
+        ]
+
+    def __init__(self, snapshot=None):
+        """Initializes the snapshot.
+
+        Keyword arguments:
+        snapshot - A snapshot previously obtained from toJSON, or None to
+            start an empty snapshot (e.g., for a full refresh).
+        """
+        self._totalCount = None
+        self._repos = {}
+        self._isIncremental = snapshot != None
+        # Snapshots from before the time of the refresh was recorded
+        # are treated as due for a full refresh.
+        self._refreshed = snapshot.get("refreshed", 0) if snapshot != None else time.time()
+        if snapshot != None:
+            for repo in snapshot["repositories"]:
+                self._repos[repo["name"]] = repo
+
+    def addPage(self, page):
+        """Adds a page of the results of the repo stats query, returning
+        True if an unchanged repository was reached, in which case
+        no further pages are needed.
+
+        Keyword arguments:
+        page - One page of the results of the repo stats query.
+        """
+        return self.addRepositories(page["data"]["user"]["repositories"])
+
+    def addRepositories(self, repositories):
+        """Adds a page of a repositories connection, returning True if an
+        unchanged repository was reached, in which case no further pages
+        are needed. The total count of owned repositories is taken from
+        the first page.
+
+        Keyword arguments:
+        repositories - A repositories connection with totalCount and nodes.
+        """
+        if self._totalCount == None:
+            self._totalCount = repositories["totalCount"]
+        if repositories["nodes"] != None:
+            for repo in repositories["nodes"]:
+                if self._isIncremental and isUnchanged(self._repos.get(repo["name"]), repo):
+                    return True
+                self._repos[repo["name"]] = repo
+        return False
+
+    def isConsistent(self):
+        """Checks whether the number of repositories in the snapshot matches
+        the total count of owned repositories. If not, then some were deleted
+        or renamed since the previous snapshot, and a full refresh is needed.
+        """
+        return self._totalCount != None and self._totalCount == len(self._repos)
+
+    def isOlderThan(self, maxAge):
+        """Checks whether the last full refresh of the snapshot was more
+        than maxAge seconds ago.
+
+        Keyword arguments:
+        maxAge - The maximum age, in seconds, of the last full refresh.
+        """
+        return time.time() - self._refreshed > maxAge
+
+    def refreshed(self):
+        """Gets the time, in seconds since the epoch, of the last full refresh."""
+        return self._refreshed
+
+    def totalCount(self):
+        """Gets the total count of owned repositories."""
+        return self._totalCount
+
+    def repositories(self):
+        """Gets the list of the repository nodes."""
+        return list(self._repos.values())
+
+    def toJSON(self):
+        """Gets the snapshot in a JSON serializable form."""
+        return {
+            "refreshed" : self._refreshed,
+            "totalCount" : self._totalCount,
+            "repositories" : self.repositories()
+            }
+
+def isUnchanged(previous, repo):
+    """Checks whether a repository hasn't changed since a previous snapshot.
+
+    Keyword arguments:
+    previous - The repository's node from the previous snapshot, or None.
+    repo - The repository's node from the current query.
+    """
+    return (previous != None and
+            previous.get("updatedAt") == repo.get("updatedAt") and
+            previous.get("pushedAt") == repo.get("pushedAt"))
@@ -0,0 +1,218 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+class ResponseCache:
+    """A persistent on-disk cache of GitHub API responses. Each entry is
+    a gzip compressed JSON file, written to a temporary file and atomically
+    renamed into place, so parallel jobs sharing the cache directory never
+    see partial entries. The access time of an entry is tracked through its
+    modification time, and the least recently used entries are evicted
+    whenever the cache exceeds its byte budget. The keys include the scope
+    of the token, so that workflows sharing the cache with tokens of
+    different access (e.g., to private repositories) never serve each
+    other's responses, while runs with the same kind of token, such as the
+    GITHUB_TOKEN that is minted anew for every job, share their entries.
+    """
+
+    __slots__ = [
+        '_directory',
+        '_maxBytes',
+        '_scope'
+        ]
+
+    def __init__(self, directory, maxBytes=64*1024*1024, scope=None):
+        """Initializes the cache, creating the directory if necessary.
+
+        Keyword arguments:
+        directory - The directory for the cache entries.
+        maxBytes - The maximum total size, in bytes, of the cache entries.
+        scope - The scope of the token with which the responses are queried
+            (see tokenScope), or None.
+        """
+        self._directory = directory
+        self._maxBytes = maxBytes
+        self._scope = scope
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def fromEnvironment(cls, directory, maxBytes=64*1024*1024):
+        """Creates a cache whose scope is that of the GITHUB_TOKEN of the
+        GitHub Actions runner, in the repository in which the action runs.
+
+        Keyword arguments:
+        directory - The directory for the cache entries.
+        maxBytes - The maximum total size, in bytes, of the cache entries.
+        """
+        return cls(
+            directory,
+            maxBytes,
+            tokenScope(
+                os.environ.get("GITHUB_TOKEN", "").strip(),
+                os.environ.get("GITHUB_REPOSITORY", ""))
+            )
+
+    def key(self, kind, text, owner, variables=None):
+        """Computes the key of a cache entry, which is specific to the
+        scope of the cache.
+
+        Keyword arguments:
+        kind - The kind of request, such as graphql or a REST endpoint.
+        text - The query text.
+        owner - The login of the user queried.
+        variables - A dictionary of any other variables of the query.
+        """
+        return hashlib.sha256(
+            json.dumps(
+                [kind, text, owner, variables, self._scope],
+                sort_keys=True
+                ).encode("utf-8")
+            ).hexdigest()
+
+    def get(self, key):
+        """Gets an entry, whether or not it has expired, or returns None if
+        there is no such entry. An entry is a dictionary with the fields:
+        response, expires (time in seconds since the epoch), and etag
+        (which may be None).
+
+        Keyword arguments:
+        key - The key of the entry.
+        """
+        filename = self._filename(key)
+        try:
+            with gzip.open(filename, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(filename)
+            return entry
+        except (OSError, EOFError, ValueError):
+            return None
+
+    def getFresh(self, key):
+        """Gets the response of an entry that hasn't expired yet, or returns
+        None if there is no such entry.
+
+        Keyword arguments:
+        key - The key of the entry.
+        """
+        entry = self.get(key)
+        if entry != None and isFresh(entry):
+            return entry["response"]
+        return None
+
+    def put(self, key, response, timeToLive, etag=None):
+        """Stores an entry, and then evicts least recently used entries
+        if the cache is over its byte budget.
+
+        Keyword arguments:
+        key - The key of the entry.
+        response - The response, which must be JSON serializable.
+        timeToLive - The number of seconds until the entry expires.
+        etag - The ETag of the response, if any, for revalidation.
+        """
+        entry = {
+            "expires" : time.time() + timeToLive,
+            "etag" : etag,
+            "response" : response
+            }
+        try:
+            fd, tempName = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(json.dumps(entry).encode("utf-8")))
+            os.replace(tempName, self._filename(key))
+        except OSError as e:
+            print(f"WARNING: Failed to write to the response cache: {e}")
+            return
+        self.evict()
+
+    def evict(self):
+        """Removes least recently used entries until the total size
+        of the cache is within its byte budget.
+        """
+        entries = []
+        totalSize = 0
+        with os.scandir(self._directory) as it:
+            for f in it:
+                if f.name.endswith(".json.gz"):
+                    try:
+                        info = f.stat()
+                    except OSError:
+                        continue
+                    entries.append((info.st_mtime, info.st_size, f.path))
+                    totalSize += info.st_size
+        if totalSize <= self._maxBytes:
+            return
+        entries.sort()
+        for mtime, size, path in entries:
+            try:
+                os.remove(path)
+            except OSError:
+                pass # already removed by a concurrent job
+            totalSize -= size
+            if totalSize <= self._maxBytes:
+                break
+
+    def _filename(self, key):
+        """Gets the filename of an entry.
+
+        Keyword arguments:
+        key - The key of the entry.
+        """
+        return os.path.join(self._directory, key + ".json.gz")
+
+# The prefixes of GitHub's kinds of tokens, such as ghs_ for the
+# GITHUB_TOKEN of a workflow (and other installation tokens of apps).
+_tokenPrefixes = ["ghs_", "ghp_", "gho_", "ghu_", "github_pat_"]
+
+def tokenScope(token, repository):
+    """Computes the scope of a token, which determines what it can access,
+    from the kind of token and the repository of the workflow using it, or
+    returns None if there is no token. The scope is stable across runs, even
+    though a workflow's GITHUB_TOKEN changes for every job, and it doesn't
+    include the token itself.
+
+    Keyword arguments:
+    token - The token, or None.
+    repository - The repository, owner/name, of the workflow.
+    """
+    if token == None or len(token) == 0:
+        return None
+    kind = next((prefix for prefix in _tokenPrefixes if token.startswith(prefix)), "classic")
+    return kind + repository
+
+def isFresh(entry):
+    """Checks whether a cache entry has not yet expired.
+
+    Keyword arguments:
+    entry - The cache entry.
+    """
+    return entry["expires"] > time.time()
@@ -0,0 +1,218 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import random
+import time
+
+# HTTP statuses of failures that are likely to succeed if retried.
+_transientStatuses = {500, 502, 503, 504}
+
+# GraphQL error types, and fragments of error messages, of failures that
+# are likely to succeed if retried.
+_transientErrorTypes = {"RATE_LIMITED", "SERVICE_UNAVAILABLE", "TIMEOUT"}
+_transientErrorMessages = ["timeout", "timed out", "something went wrong", "secondary rate limit"]
+# Fragments of the output of a failed command (e.g., gh) that indicate a
+# failure that is likely to succeed if retried.
+_transientOutputMessages = _transientErrorMessages + [
+    "http 500", "http 502", "http 503", "http 504",
+    "server error", "bad gateway", "service unavailable", "gateway timeout"]
+_expensiveErrorTypes = {"RESOURCE_LIMITS_EXCEEDED", "MAX_NODE_LIMIT_EXCEEDED", "TIMEOUT"}
+_expensiveErrorMessages = ["resource limits", "timeout", "timed out"]
+
+class TransientError(Exception):
+    """Raised for a failure that is likely to succeed if retried."""
+
+    def __init__(self, message, retryAfter=None, result=None):
+        """Initializes the error.
+
+        Keyword arguments:
+        message - A description of the failure.
+        retryAfter - The number of seconds the server asked to wait
+            before retrying, or None if it didn't say.
+        result - The result of the failed attempt, if any.
+        """
+        super().__init__(message)
+        self.retryAfter = retryAfter
+        self.result = result
+
+class RetryPolicy:
+    """Retries operations that fail with a TransientError, with jittered
+    exponential backoff (or the delay the server asked for), within a
+    budget of attempts and of total time.
+    """
+
+    __slots__ = [
+        '_maxAttempts',
+        '_maxTime',
+        '_baseDelay',
+        '_maxDelay',
+        '_sleep'
+        ]
+
+    def __init__(self, maxAttempts=5, maxTime=300, baseDelay=1, maxDelay=60, sleep=time.sleep):
+        """Initializes the retry policy.
+
+        Keyword arguments:
+        maxAttempts - The maximum number of attempts of an operation.
+        maxTime - The maximum total number of seconds to spend on an operation,
+            including the delays between attempts.
+        baseDelay - The delay, in seconds, before the first retry, which
+            doubles with each subsequent retry, before jitter.
+        maxDelay - The maximum delay, in seconds, between attempts, unless
+            the server asked for longer.
+        sleep - The function to call to wait a number of seconds.
+        """
+        self._maxAttempts = maxAttempts
+        self._maxTime = maxTime
+        self._baseDelay = baseDelay
+        self._maxDelay = maxDelay
+        self._sleep = sleep
+
+    def run(self, operation):
+        """Calls an operation until it succeeds, fails with something other
+        than a TransientError, or the budget is exhausted, in which case the
+        last TransientError is raised. Returns the result of the operation.
+
+        Keyword arguments:
+        operation - A function of no arguments.
+        """
+        startTime = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                return operation()
+            except TransientError as e:
+                if not self.backoff(attempt, startTime, e):
+                    raise
+                attempt += 1
+
+    def backoff(self, attempt, startTime, error):
+        """Waits before the next attempt of an operation that failed
+        with a TransientError, returning True, or returns False without
+        waiting if the attempt or time budget doesn't allow a retry.
+
+        Keyword arguments:
+        attempt - The number of the attempt that failed, starting from 1.
+        startTime - The time.monotonic() when the first attempt started.
+        error - The TransientError.
+        """
+        if error.retryAfter != None:
+            delay = max(0, error.retryAfter)
+        else:
+            cap = min(self._maxDelay, self._baseDelay * 2 ** (attempt - 1))
+            delay = cap / 2 + random.random() * cap / 2
+        if (attempt >= self._maxAttempts or
+            time.monotonic() - startTime + delay > self._maxTime):
+            return False
+        print(f"WARNING: {error}; retrying in {delay:.1f} seconds (attempt {attempt + 1} of {self._maxAttempts}).")
+        self._sleep(delay)
+        return True
+
+def transientStatusError(status, headers, body=""):
+    """Returns a TransientError if an HTTP response's status indicates a
+    failure that is likely to succeed if retried, such as a 502, or a
+    403 or 429 due to a secondary rate limit, and otherwise returns None.
+
+    Keyword arguments:
+    status - The HTTP status code.
+    headers - A dictionary of the response headers, with lowercase names.
+    body - The response body.
+    """
+    if status in _transientStatuses:
+        return TransientError(f"HTTP {status}", retryAfterSeconds(headers))
+    if status in {403, 429}:
+        retryAfter = retryAfterSeconds(headers)
+        if retryAfter == None and "secondary rate limit" in body.lower():
+            # GitHub asks to wait at least a minute if it doesn't say how long.
+            retryAfter = 60
+        if retryAfter != None:
+            return TransientError(f"HTTP {status} (rate limited)", retryAfter)
+    return None
+
+def retryAfterSeconds(headers):
+    """Gets the number of seconds a response asked to wait, from its
+    Retry-After header, or from its x-ratelimit-reset header if the rate
+    limit is exhausted, or None if it didn't ask.
+
+    Keyword arguments:
+    headers - A dictionary of the response headers, with lowercase names.
+    """
+    try:
+        if "retry-after" in headers:
+            return int(headers["retry-after"])
+        if headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers:
+            return max(0, int(headers["x-ratelimit-reset"]) - time.time())
+    except ValueError:
+        pass
+    return None
+
+def hasTransientErrors(result):
+    """Checks if a parsed GraphQL response has errors that are likely
+    to go away if the query is retried.
+
+    Keyword arguments:
+    result - The parsed response.
+    """
+    if not isinstance(result, dict) or "errors" not in result:
+        return False
+    for error in result["errors"]:
+        if error.get("type") in _transientErrorTypes:
+            return True
+        message = str(error.get("message", "")).lower()
+        if any(m in message for m in _transientErrorMessages):
+            return True
+    return False
+
+def isTransientOutput(output):
+    """Checks if the output of a failed command, such as gh, describes a
+    failure that is likely to succeed if retried, such as a secondary rate
+    limit or a 5xx server error, rather than a permanent failure, such as
+    a validation or authentication error.
+
+    Keyword arguments:
+    output - The output of the command.
+    """
+    output = output.lower()
+    return any(m in output for m in _transientOutputMessages)
+
+def hasExpensiveQueryErrors(result):
+    """Checks if a parsed GraphQL response has errors indicating that
+    the query was too expensive for GitHub to serve, such as exceeding
+    its resource limits or timing out, which a smaller page may avoid.
+
+    Keyword arguments:
+    result - The parsed response.
+    """
+    if not isinstance(result, dict) or "errors" not in result:
+        return False
+    for error in result["errors"]:
+        if error.get("type") in _expensiveErrorTypes:
+            return True
+        message = str(error.get("message", "")).lower()
+        if any(m in message for m in _expensiveErrorMessages):
+            return True
+    return False
@@ -108,14 +108,97 @@ statsByCategory = {
 
 _locale_directory = "/locales/"
 
+# The bundle of all of the supported locales, which util/LocaleBundle.py
+# generates from the locales after validating them (see validateLocale).
+_locale_bundle_file = "bundle.json"
+
+# The index of the lengths of the labels of the locales (see loadLabelWidths),
+# which util/LocaleWidths.py generates from the locales.
+_label_widths_file = "label-widths.json"
+
+# The locales, bundle, and label lengths loaded so far, which are shared
+# by all of the cards of a run.
+_loaded_locales = {}
+_locale_bundle = None
+_label_widths = None
+
 def loadLocale(locale) :
-    """Loads the specified locale.
+    """Loads the specified locale. The locale is loaded from the bundle
+    of all of the locales the first time it is needed, or if the bundle
+    is missing or doesn't include it, from the locale's own file, and is
+    then memoized. The returned dictionary is shared, so must not be
+    modified.
 
     Keyword arguments:
     locale - The locale code to load.
     """
-    with open(_locale_directory + locale + ".json", "r", encoding="utf8") as f:
-        return json.load(f)
+    global _locale_bundle
+    if locale not in _loaded_locales:
+        if _locale_bundle == None:
+            try:
+                with open(_locale_directory + _locale_bundle_file, "r", encoding="utf8") as f:
+                    _locale_bundle = json.load(f)
+            except OSError:
+                _locale_bundle = {}
+        if locale in _locale_bundle:
+            _loaded_locales[locale] = _locale_bundle[locale]
+        else:
+            with open(_locale_directory + locale + ".json", "r", encoding="utf8") as f:
+                _loaded_locales[locale] = json.load(f)
+    return _loaded_locales[locale]
+
+def validateLocale(labels) :
+    """Validates the labels of a locale, raising a ValueError that lists
+    the problems if any required labels are missing or aren't strings,
+    such as if they don't include a label for each category of categoryOrder
+    and each stat of statsByCategory.
+
+    Keyword arguments:
+    labels - The labels of the locale, as loaded by loadLocale.
+    """
+    problems = []
+    title = labels.get("titleTemplate")
+    if not isinstance(title, str) or "{0}" not in title:
+        problems.append("titleTemplate must be a string with a {0} for the name")
+    categoryLabels = labels.get("categoryLabels", {})
+    for category in categoryOrder:
+        headerRow = categoryLabels.get(category)
+        if not isinstance(headerRow, dict):
+            problems.append("categoryLabels is missing " + category)
+            continue
+        if not isinstance(headerRow.get("heading"), str):
+            problems.append("categoryLabels." + category + ".heading must be a string")
+        for column in ["column-one", "column-two"]:
+            if column not in headerRow or not (
+                headerRow[column] == None or isinstance(headerRow[column], str)):
+                problems.append("categoryLabels." + category + "." + column + " must be a string or null")
+    statLabels = labels.get("statLabels", {})
+    for category, keys in statsByCategory.items():
+        for key in keys:
+            if not isinstance(statLabels.get(key), str):
+                problems.append("statLabels." + key + " must be a string")
+    if len(problems) > 0:
+        raise ValueError("; ".join(problems))
+
+def loadLabelWidths(locale) :
+    """Loads the precomputed lengths of the labels of a locale, in
+    DejaVu Sans 110pt font, as a dictionary mapping each label to its
+    length. Returns an empty dictionary if the index of the lengths is
+    missing or doesn't include the locale, in which case the labels are
+    measured as needed. The index is loaded once and then shared, so
+    the returned dictionary must not be modified.
+
+    Keyword arguments:
+    locale - The locale code.
+    """
+    global _label_widths
+    if _label_widths == None:
+        try:
+            with open(_locale_directory + _label_widths_file, "r", encoding="utf8") as f:
+                _label_widths = json.load(f)
+        except OSError:
+            _label_widths = {}
+    return _label_widths.get(locale, {})
 
 # ADDITIONAL LICENSE NOTES
 #
@@ -25,10 +25,58 @@
 # SOFTWARE.
 #
 
+import calendar
 import json
 import subprocess
 import os
 import sys
+import tempfile
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from GitHubClient import GitHubClient, findPageInfo
+from ResponseCache import ResponseCache, isFresh
+from RepositoryAggregator import RepositoryAggregator
+from RepositorySnapshot import RepositorySnapshot
+from RateLimiter import RateLimiter
+from RetryPolicy import RetryPolicy, TransientError, hasTransientErrors, isTransientOutput
+from QueryPlanner import QueryPlan
+from QueryCombiner import combineQueries, splitCombinedResult, isCompleteCombinedResult
+from Tracer import tracer
+
+# The maximum number of GitHub API queries to run concurrently.
+_maxConcurrentQueries = 6
+
+# The maximum number of queries of one year of contributions to run concurrently.
+_maxConcurrentYearQueries = 4
+
+# Time to live, in seconds, of cached responses by query name. The
+# search counts are revalidated with their ETags once they expire.
+_cacheTimeToLive = {
+    "basicstats" : 3600,
+    "basicstats2" : 3600,
+    "contributions" : 3600,
+    "combined" : 3600,
+    "oneYear" : 3600,
+    # The contributions of years that have been closed for the grace period
+    # never change, so they are effectively cached forever (subject to eviction).
+    "closedYear" : 100 * 365 * 24 * 3600,
+    "repostats" : 3600,
+    "search/commits" : 3600,
+    "search/issues" : 3600,
+    # Snapshots of the repositories from which the repo stats are
+    # incrementally refreshed. A full refresh is forced once the last
+    # full refresh of a snapshot is older than this.
+    "snapshot" : 7 * 24 * 3600
+}
+_defaultTimeToLive = 3600
+
+# Commits count toward the year in which they were authored, even if they
+# land on the default branch later, so the contributions of a year may still
+# change for a while after it ends. A year is closed, and cached forever, only
+# once this many seconds of the next year have passed.
+_closedYearGracePeriod = 30 * 24 * 3600
 
 def set_outputs(names_values):
     """Sets the GitHub Action outputs.
@@ -44,6 +92,76 @@ def set_outputs(names_values):
         for name, value in names_values.items():
             print("::set-output name={0}::{1}".format(name, value))
 
+def isClosedYear(year, now):
+    """Checks whether the contributions of a year can no longer change,
+    which is the case once the grace period into the next year has passed.
+
+    Keyword arguments:
+    year - The year.
+    now - The current time, in seconds since the epoch.
+    """
+    return calendar.timegm((year + 1, 1, 1, 0, 0, 0)) + _closedYearGracePeriod <= now
+
+def echoErrors(errors):
+    """Logs the captured error output of a command, such as gh, to stderr,
+    where it would have gone had it not been captured, and returns it
+    without surrounding whitespace.
+
+    Keyword arguments:
+    errors - The error output.
+    """
+    errors = errors.strip()
+    if len(errors) > 0:
+        print(errors, file=sys.stderr)
+    return errors
+
+def isSuccessfulResult(result):
+    """Checks if the parsed result of a GraphQL query (or list of
+    pages) contains data and no errors.
+
+    Keyword arguments:
+    result - The parsed result of a query.
+    """
+    if result == None:
+        return False
+    pages = [result] if isinstance(result, dict) else result
+    return len(pages) > 0 and all(
+        page.get("data") != None and "errors" not in page for page in pages)
+
+def decodeConcatenatedPages(stream, chunkSize=65536):
+    """Incrementally decodes the output of gh api graphql --paginate, which
+    writes the pages one after the other without separators, yielding each
+    parsed page as soon as it is complete. At most about one page of text
+    is buffered at a time.
+
+    Keyword arguments:
+    stream - A text stream, such as the stdout pipe of gh.
+    chunkSize - The number of characters to read at a time.
+    """
+    # Quotes within JSON strings are escaped, so an unescaped {"data"
+    # after the start of the buffer can only be the start of the next page.
+    decoder = json.JSONDecoder()
+    buffer = ""
+    searchFrom = 1
+    for chunk in iter(lambda: stream.read(chunkSize), ""):
+        buffer += chunk
+        while True:
+            boundary = buffer.find('{"data"', searchFrom)
+            if boundary < 0:
+                # Next search overlaps the end of this chunk by less than a match.
+                searchFrom = max(1, len(buffer) - 6)
+                break
+            text = buffer[:boundary]
+            if len(text.strip()) > 0:
+                yield json.loads(text)
+            buffer = buffer[boundary:]
+            searchFrom = 1
+    buffer = buffer.strip()
+    while len(buffer) > 0:
+        page, end = decoder.raw_decode(buffer)
+        yield page
+        buffer = buffer[end:].strip()
+
 class Statistician:
     """The Statistician class executes GitHub GraphQl queries,
     and parses the query results.
@@ -59,7 +177,15 @@ class Statistician:
         '_autoLanguages',
         '_maxLanguages',
         '_languageRepoExclusions',
-        '_featuredRepo'
+        '_featuredRepo',
+        '_client',
+        '_ghLock',
+        '_ghConfigured',
+        '_cache',
+        '_rateLimiter',
+        '_retryPolicy',
+        '_owner',
+        '_plan'
         ]
 
     def __init__(
@@ -68,7 +194,15 @@ class Statistician:
         autoLanguages,
         maxLanguages,
         languageRepoExclusions,
-        featuredRepo):
+        featuredRepo,
+        cacheDirectory=None,
+        rateLimiter=None,
+        retryPolicy=None,
+        owner=None,
+        client=None,
+        cache=None,
+        organization=False,
+        plan=None):
         """The initializer executes the queries and parses the results.
         Upon completion of the intitializer, the user statistics will
         be available.
@@ -80,46 +214,253 @@ class Statistician:
         maxLanguages - The maximum number of languages to display. Must be at least 1. If less than
             1, it treats it as if it was 1.
         languageRepoExclusions - A set of repositories to exclude from language stats
+        featuredRepo - The name of a repository to feature, or None.
+        cacheDirectory - The directory for the persistent response cache, or None
+            to disable the cache.
+        rateLimiter - A RateLimiter to share with other Statisticians using the
+            same token, or None for a new one.
+        retryPolicy - The RetryPolicy for queries that fail with transient errors,
+            or None for the default policy.
+        owner - The login of the user whose stats are queried, or None for the
+            owner of the repository in which the action runs.
+        client - A GitHubClient to share with other Statisticians, or None to
+            create one from the environment.
+        cache - A ResponseCache to share with other Statisticians, which takes
+            precedence over cacheDirectory, or None.
+        organization - If True, the owner is an organization, and the stats
+            are the aggregate stats of its repositories.
+        plan - The QueryPlan of the stats the card displays, which limits the
+            queries to those stats, or None to query all stats.
         """
+        self._owner = owner
+        self._plan = plan if plan != None else QueryPlan()
         self._autoLanguages = autoLanguages
         self._maxLanguages = maxLanguages if maxLanguages >= 1 else 1
         self._languageRepoExclusions = languageRepoExclusions
         self._featuredRepo = featuredRepo
-        self.ghDisableInteractivePrompts()
+        # Queries go through an in-process client when a token is
+        # available, otherwise (or on transport failures) through gh.
+        self._rateLimiter = rateLimiter if rateLimiter != None else RateLimiter()
+        self._retryPolicy = retryPolicy if retryPolicy != None else RetryPolicy()
+        self._client = client if client != None else GitHubClient.fromEnvironment(
+            self._rateLimiter, self._retryPolicy)
+        self._ghLock = threading.Lock()
+        self._ghConfigured = False
+        if cache != None:
+            self._cache = cache
+        else:
+            self._cache = ResponseCache.fromEnvironment(cacheDirectory) if cacheDirectory != None else None
+        try:
+            if organization:
+                self.fetchOrganizationStats(fail)
+            else:
+                self.fetchUserStats(fail)
+        finally:
+            # A client shared with other Statisticians is closed by its owner.
+            if client == None and self._client != None:
+                self._client.close()
+        self._rateLimiter.report()
+
+    def fetchUserStats(self, fail):
+        """Executes the queries of the stats of a user and parses the results.
+
+        Keyword arguments:
+        fail - If True, the workflow will fail if there are errors.
+        """
         basicStatsQuery = self.loadQuery("/queries/basicstats.graphql",
                                          fail)
         contributionsQuery = self.loadQuery("/queries/contributions.graphql",
                                          fail)
         additionalRepoStatsQuery = self.loadQuery("/queries/repostats.graphql",
                                                   fail)
+        updatedRepoStatsQuery = self.loadQuery("/queries/repostatsUpdated.graphql",
+                                               fail)
         # GitHub changed something on or around July 16, 2026 that causes
         # queries for repositoriesContributedTo to fail for some users but
         # not others. Query it separately, but don't fail the action on errors.
         reposContributedToQuery = self.loadQuery("/queries/basicstats2.graphql",
                                          fail)
-        #oneYearContribTemplate = self.loadQuery("/queries/oneYear.graphql",
-        #                                        fail)
+        oneYearContribTemplate = self.loadQuery("/queries/oneYear.graphql",
+                                                fail)
         #oneYearContribTemplate = self.loadQuery("/queries/singleYearQueryFragment.graphql",
         #                                        fail)
         #reposContributedTo = self.loadQuery("/queries/reposContributedTo.graphql",
         #                                         fail)
         
-        self.parseStats(
-            self.executeQuery(basicStatsQuery,
-                              failOnError=fail,
-                              queryName="basicstats"),
-            self.executeQuery(contributionsQuery,
-                              failOnError=fail,
-                              queryName="contributions"),
-            self.executeQuery(additionalRepoStatsQuery,
-                              needsPagination=True,
-                              failOnError=fail,
-                              queryName="repostats"),
-            totalCommits = self.fetchTotalCommits(),
-            totalReviews = self.fetchTotalPullRequestReviews(),
-            contribToData = self.executeOptionalQuery(reposContributedToQuery, 
-                            queryName="basicstats2")
-        )
+        # Only the queries of stats that the card displays are executed.
+        singleObjectQueries = [("basicstats", basicStatsQuery, False)]
+        if self._plan.needsContributedTo():
+            # The optional query is first, so that if the combined query fails,
+            # the first split isolates it from the others.
+            singleObjectQueries.insert(0, ("basicstats2", reposContributedToQuery, True))
+        if self._plan.needsContributions():
+            singleObjectQueries.append(("contributions", contributionsQuery, False))
+        
+        # The combined query and the repositories query run concurrently. The
+        # yearly queries depend on the years of contributions from the combined
+        # query, and the search queries run only if the yearly queries fail, so
+        # those wait. Any exit triggered by a failed query within a worker thread
+        # is re-raised here by result(), preserving the fail-on-error behavior.
+        with ThreadPoolExecutor(max_workers=_maxConcurrentQueries) as executor:
+            # The small queries of the user are sent as one combined query.
+            singleObjectStats = executor.submit(
+                self.executeCombinedQueries,
+                singleObjectQueries,
+                fail)
+            if self._plan.needsRepositories():
+                repoStats = executor.submit(
+                    self.fetchRepoStats,
+                    self._plan.repoStatsQuery(additionalRepoStatsQuery),
+                    self._plan.repoStatsQuery(updatedRepoStatsQuery),
+                    fail)
+            # The yearly queries need the years of contributions from the
+            # contributions query, so they start once it completes, while
+            # the repositories are still being queried. The search API is
+            # only a fallback for the all-time totals if they fail.
+            singleObjectStats = singleObjectStats.result()
+            contributionStats = singleObjectStats.get("contributions")
+            yearlyQueryResults = None
+            if self._plan.needsYearlyContributions():
+                yearlyQueryResults = self.fetchAllTimeContributions(
+                    contributionStats["data"]["user"][
+                        "contributionsCollection"].get("contributionYears"),
+                    oneYearContribTemplate)
+            totalCommits = None
+            totalReviews = None
+            if yearlyQueryResults == None and self._plan.needsTotalCommits():
+                totalCommits = executor.submit(self.fetchTotalCommits)
+            if yearlyQueryResults == None and self._plan.needsTotalReviews():
+                totalReviews = executor.submit(self.fetchTotalPullRequestReviews)
+        
+        repoStats = repoStats.result() if self._plan.needsRepositories() else []
+        totalCommits = totalCommits.result() if totalCommits != None else None
+        totalReviews = totalReviews.result() if totalReviews != None else None
+        with tracer.span("parseStats"):
+            self.parseStats(
+                singleObjectStats["basicstats"],
+                contributionStats,
+                repoStats,
+                totalCommits = totalCommits,
+                totalReviews = totalReviews,
+                contribToData = singleObjectStats.get("basicstats2")
+            )
+            if yearlyQueryResults != None:
+                self.combineYears(yearlyQueryResults)
+
+    def fetchAllTimeContributions(self, contributionYears, oneYearContribTemplate):
+        """Queries the contributions of each year of activity, running up to
+        _maxConcurrentYearQueries of the queries concurrently, and returns the
+        list of the results of the yearly queries, or None if there are no
+        years or any of the queries failed. Years that have closed are cached
+        indefinitely, since their contributions no longer change, so once the
+        cache is warm only the current year (and early in a year, the previous
+        year) is queried.
+
+        Keyword arguments:
+        contributionYears - The list of years in which the user contributed, or None.
+        oneYearContribTemplate - The query of one year of contributions, with
+            {YEAR} in place of the year.
+        """
+        if contributionYears == None or len(contributionYears) == 0:
+            return None
+        now = time.time()
+        def queryYear(year):
+            return self.executeOptionalQuery(
+                oneYearContribTemplate.replace("{YEAR}", str(year)),
+                queryName="closedYear" if isClosedYear(year, now) else "oneYear")
+        with ThreadPoolExecutor(max_workers=_maxConcurrentYearQueries) as executor:
+            yearlyQueryResults = list(executor.map(queryYear, contributionYears))
+        if any(result == None for result in yearlyQueryResults):
+            return None
+        return yearlyQueryResults
+
+    def fetchOrganizationStats(self, fail):
+        """Executes the query of the stats of an organization and parses
+        the results. The pages of the organization's repositories are
+        aggregated as they arrive, so memory use doesn't grow with the
+        number of repositories.
+
+        Keyword arguments:
+        fail - If True, the workflow will fail if there are errors.
+        """
+        orgStatsQuery = self._plan.repoStatsQuery(
+            self.loadQuery("/queries/orgstats.graphql", fail))
+        aggregator = RepositoryAggregator(self._languageRepoExclusions)
+        organization = {}
+        def consumePage(page):
+            if len(organization) == 0:
+                organization.update(
+                    (field, value) for field, value in page["data"]["organization"].items()
+                    if field != "repositories")
+            aggregator.addPage(page)
+        self.executeQuery(
+            orgStatsQuery,
+            needsPagination=True,
+            failOnError=fail,
+            queryName="orgstats",
+            pageConsumer=consumePage)
+        with tracer.span("parseOrganizationStats"):
+            self.parseOrganizationStats(organization, aggregator)
+
+    def fetchRepoStats(self, repoStatsQuery, updatedRepoStatsQuery, failOnError=True):
+        """Queries the stats of the owned repositories, and returns a
+        RepositoryAggregator of them. Without the cache, the pages of
+        repositories are aggregated as they arrive. With the cache, a
+        snapshot of the repositories from a previous run is brought up to
+        date with only the recently updated repositories, falling back to
+        a full refresh if there is no snapshot, it is inconsistent, or its
+        last full refresh is older than the snapshot's time to live.
+
+        Keyword arguments:
+        repoStatsQuery - The query for all of the owned repositories.
+        updatedRepoStatsQuery - The query for the owned repositories, ordered
+            by most recently updated first.
+        failOnError - If True, the workflow will fail if there is an error.
+        """
+        aggregator = RepositoryAggregator(self._languageRepoExclusions)
+        if self._cache == None:
+            self.executeQuery(
+                repoStatsQuery,
+                needsPagination=True,
+                failOnError=failOnError,
+                queryName="repostats",
+                pageConsumer=aggregator.addPage)
+            return aggregator
+        owner = self.getOwner(failOnError)
+        key = self._cache.key("snapshot", repoStatsQuery, owner)
+        previous = self._cache.getFresh(key)
+        snapshot = None
+        if previous != None:
+            snapshot = RepositorySnapshot(previous)
+            if snapshot.isOlderThan(_cacheTimeToLive["snapshot"]):
+                snapshot = None
+        if snapshot != None:
+            self.executeQuery(
+                updatedRepoStatsQuery,
+                needsPagination=True,
+                failOnError=failOnError,
+                queryName="repostatsUpdated",
+                pageConsumer=snapshot.addPage)
+            if not snapshot.isConsistent():
+                snapshot = None
+        if snapshot == None:
+            snapshot = RepositorySnapshot()
+            self.executeQuery(
+                repoStatsQuery,
+                needsPagination=True,
+                failOnError=failOnError,
+                queryName="repostats",
+                pageConsumer=snapshot.addPage)
+        # The entry expires when the next full refresh is due.
+        self._cache.put(
+            key,
+            snapshot.toJSON(),
+            snapshot.refreshed() + _cacheTimeToLive["snapshot"] - time.time())
+        aggregator.addRepositories({
+            "totalCount" : snapshot.totalCount(),
+            "nodes" : snapshot.repositories()
+            })
+        return aggregator
 
     def getStatsByKey(self, key):
         """Gets a category of stats by key.
@@ -168,12 +509,23 @@ class Statistician:
 
         Keyword arguments:
         basicStats - The results of the basic stats query.
-        contributionStats - The results of the contributions stats query.
-        repoStats - The results of the repo stats query.
+        contributionStats - The results of the contributions stats query, or None
+            if it wasn't queried.
+        repoStats - The pages of results of the repo stats query, or a
+            RepositoryAggregator that has already consumed them.
         """
         
         # Merge split queries
-        basicStats["data"]["user"]["contributionsCollection"] = contributionStats["data"]["user"]["contributionsCollection"]
+        if contributionStats != None:
+            basicStats["data"]["user"]["contributionsCollection"] = contributionStats["data"]["user"]["contributionsCollection"]
+        else: # not queried since not displayed, just set to 0, which will auto-exclude the rows
+            basicStats["data"]["user"]["contributionsCollection"] = dict.fromkeys(
+                ["totalCommitContributions",
+                 "totalIssueContributions",
+                 "totalPullRequestContributions",
+                 "totalPullRequestReviewContributions",
+                 "restrictedContributionsCount"],
+                0)
         if contribToData != None:
             basicStats["data"]["user"]["repositoriesContributedTo"] = contribToData["data"]["user"]["repositoriesContributedTo"]
         else: # the optional query failed, just set to 0, which will auto-exclude the row
@@ -221,24 +573,19 @@ class Statistician:
         issues = basicStats["data"]["user"]["issues"]["totalCount"]
         pullRequests = basicStats["data"]["user"]["pullRequests"]["totalCount"]
 
-        # Reorganize for simplicity
-        repoStats = list(map(lambda x : x["data"]["user"]["repositories"], repoStats))
-        #reposContributedToStats = list(
-        #    map(lambda x : x["data"]["user"]["topRepositories"], reposContributedToStats))
+        # Summarize the owned repositories in a single pass, unless
+        # already aggregated while the pages of the query arrived.
+        if not isinstance(repoStats, RepositoryAggregator):
+            aggregator = RepositoryAggregator(self._languageRepoExclusions)
+            for page in repoStats:
+                aggregator.addPage(page)
+            repoStats = aggregator
 
-        # This is the count of owned repos, including all public,
-        # but may or may not include all private depending upon token used to authenticate.
-        ownedRepositories = repoStats[0]["totalCount"]
-        
         # Count num repos owned by someone else that the user has contributed to
         # NOTE: It doesn't appear that it is currently possible through any query
         # or combination of queries to actually compute this other than for the most recent
         # year's data. Keeping the query in, but changing to leave that stat blank in
         # the SVG.
-        #repositoriesContributedTo = sum(
-        #    1 for page in reposContributedToStats if page[
-        #        "nodes"] != None for repo in page[
-        #            "nodes"] if repo["owner"]["login"] != self._login)
         
         self._contrib = {
             "commits" : [pastYearData["totalCommitContributions"]] if (
@@ -254,121 +601,53 @@ class Statistician:
             "private" : [pastYearData["restrictedContributionsCount"]]
             }
 
-        # The "nodes" field is nullable so make sure the user owns at least 1 repo. 
-        if repoStats[0]["totalCount"] > 0:
-            # Note that the explicit checks of, if page["nodes"] != None, are 
-            # precautionary since the above check of totalCount should be sufficient
-            # to protect against a null list of repos.
-            
-            # Count stargazers, forks of my repos, and watchers 
-            stargazers = sum(
-                repo["stargazerCount"] for page in repoStats if page[
-                    "nodes"] != None for repo in page[
-                        "nodes"] if not repo["isPrivate"] and not repo["isFork"])
-            forksOfMyRepos = sum(
-                repo["forkCount"] for page in repoStats if page[
-                    "nodes"] != None for repo in page[
-                        "nodes"] if not repo["isPrivate"] and not repo["isFork"])
-            stargazersAll = sum(
-                repo["stargazerCount"] for page in repoStats if page[
-                    "nodes"] != None for repo in page[
-                        "nodes"] if not repo["isPrivate"])
-            forksOfMyReposAll = sum(
-                repo["forkCount"] for page in repoStats if page[
-                    "nodes"] != None for repo in page[
-                        "nodes"] if not repo["isPrivate"])
-
-            # Find repos with most stars and most forks
-            try:
-                mostStars = max(
-                    (repo for page in repoStats if page[
-                        "nodes"] != None for repo in page[
-                            "nodes"] if not repo["isPrivate"] and not repo["isFork"]),
-                    key=lambda x : x["stargazerCount"])["name"]
-                self._user["mostStarred"] = [ mostStars ]
-            except ValueError:
-                pass
+        self.parseRepoStats(repoStats)
 
-            try:
-                mostForks = max(
-                    (repo for page in repoStats if page[
-                        "nodes"] != None for repo in page["nodes"] if not repo[
-                            "isPrivate"] and not repo["isFork"]),
-                    key=lambda x : x["forkCount"])["name"]
-                self._user["mostForked"] = [ mostForks ]
-            except ValueError:
-                pass
-            
-            # Compute number of watchers 
-            watchers = sum(
-                repo["watchers"]["totalCount"] for page in repoStats if page[
-                    "nodes"] != None for repo in page["nodes"] if not repo["isPrivate"])
-            
-            watchersNonForks = sum(
-                repo["watchers"]["totalCount"] for page in repoStats if page[
-                    "nodes"] != None for repo in page["nodes"] if not repo[
-                        "isPrivate"] and not repo["isFork"])
-            
-            # Count of private repos (not accurate since depends on token used to authenticate query,
-            # however, all those here are included in count of owned repos.
-            privateCount = sum(
-                1 for page in repoStats if page[
-                    "nodes"] != None for repo in page["nodes"] if repo["isPrivate"])
-
-            publicAll = ownedRepositories - privateCount
-
-            # Counts of archived repos
-            publicNonForksArchivedCount = sum(
-                1 for page in repoStats if page[
-                    "nodes"] != None for repo in page["nodes"] if repo[
-                        "isArchived"] and not repo["isPrivate"] and not repo["isFork"])
-            publicArchivedCount = sum(
-                1 for page in repoStats if page[
-                    "nodes"] != None for repo in page["nodes"] if repo[
-                        "isArchived"] and not repo["isPrivate"])
-
-            # Counts of template repos
-            publicNonForksTemplatesCount = sum(
-                1 for page in repoStats if page[
-                    "nodes"] != None for repo in page["nodes"] if repo[
-                        "isTemplate"] and not repo["isPrivate"] and not repo["isFork"])
-            publicTemplatesCount = sum(
-                1 for page in repoStats if page[
-                    "nodes"] != None for repo in page["nodes"] if repo[
-                        "isTemplate"] and not repo["isPrivate"])
-            
-            # Count of public non forks owned by user
-            publicNonForksCount = ownedRepositories - sum(
-                1 for page in repoStats if page["nodes"] != None for repo in page[
-                    "nodes"] if repo["isPrivate"] or repo["isFork"])
+    def parseOrganizationStats(self, organization, repoStats):
+        """Parses the organization statistics. Organizations have no
+        contributions, and the general stats are limited to the year the
+        organization joined, its sponsors, and its featured, most starred,
+        and most forked repositories.
 
-            # Compute language distribution
-            totalSize, languageData = self.summarizeLanguageStats(repoStats)
-        else:
-            # if no owned repos then set all repo related stats to 0
-            stargazers = 0
-            forksOfMyRepos = 0
-            stargazersAll = 0
-            forksOfMyReposAll = 0
-            watchers = 0
-            watchersNonForks = 0
-            privateCount = 0
-            publicAll = 0
-            publicNonForksArchivedCount = 0
-            publicArchivedCount = 0
-            publicNonForksCount = 0
-            publicNonForksTemplatesCount = 0
-            publicTemplatesCount = 0
-            totalSize, languageData = 0, {}
-
-        self._repo = {
-            "public" : [publicNonForksCount, publicAll],
-            "starredBy" : [stargazers, stargazersAll],
-            "forkedBy" : [forksOfMyRepos, forksOfMyReposAll],
-            "watchedBy" : [watchersNonForks, watchers],
-            "archived" : [publicNonForksArchivedCount, publicArchivedCount],
-            "templates" : [publicNonForksTemplatesCount, publicTemplatesCount]
-        }
+        Keyword arguments:
+        organization - The fields of the organization from the org stats query,
+            other than its repositories.
+        repoStats - A RepositoryAggregator that has consumed the pages of the
+            organization's repositories.
+        """
+        self._login = organization["login"]
+        self._name = organization["name"]
+        if self._name == None:
+            self._name = self._login
+        self._user = {}
+        self._user["joined"] = [ int(organization["createdAt"][:4]) ]
+        self._user["sponsors"] = [
+            organization["sponsorshipsAsMaintainer"]["totalCount"] ]
+        if self._featuredRepo != None:
+            self._user["featured"] = [ self._featuredRepo ]
+        self._contrib = {}
+        self.parseRepoStats(repoStats)
+
+    def parseRepoStats(self, repoStats):
+        """Parses the stats of the owned repositories, including the
+        most starred and most forked, and the language distribution.
+
+        Keyword arguments:
+        repoStats - A RepositoryAggregator that has consumed the pages of
+            the owned repositories.
+        """
+        # Find repos with most stars and most forks
+        if repoStats.mostStarred() != None:
+            self._user["mostStarred"] = [ repoStats.mostStarred() ]
+        if repoStats.mostForked() != None:
+            self._user["mostForked"] = [ repoStats.mostForked() ]
+
+        # Counts of public repos, stargazers, forks, watchers, archived repos, and
+        # templates, for non-forks and for all; and the language distribution.
+        # Note that the count of owned repos includes all public, but may or may not
+        # include all private depending upon token used to authenticate.
+        self._repo = repoStats.repoStats()
+        totalSize, languageData = repoStats.languageSummary()
 
         self._languages = self.organizeLanguageStats(totalSize, languageData)
 
@@ -433,29 +712,12 @@ class Statistician:
         """Summarizes the language distibution of the user's owned repositories.
 
         Keyword arguments:
-        repoStats - The results of the repo stats query.
+        repoStats - The repositories connections from the pages of the repo stats query.
         """
-        totalSize = 0
-        languageData = {}
+        aggregator = RepositoryAggregator(self._languageRepoExclusions)
         for page in repoStats:
-            if page["nodes"] != None:
-                for repo in page["nodes"]:
-                    if (not repo["isPrivate"] and not repo["isFork"] and
-                        (repo["name"].lower() not in self._languageRepoExclusions)):
-                        totalSize += repo["languages"]["totalSize"]
-                        if repo["languages"]["edges"] != None :
-                            for L in repo["languages"]["edges"]:
-                                name = L["node"]["name"]
-                                if name in languageData:
-                                    languageData[name]["size"] += L["size"]
-                                else:
-                                    languageData[name] = {
-                                        "color" : L["node"]["color"],
-                                        "size" : L["size"]
-                                        }
-        for L in languageData:
-            languageData[L]["percentage"] = languageData[L]["size"] / totalSize
-        return totalSize, languageData
+            aggregator.addRepositories(page)
+        return aggregator.languageSummary()
 
     def createPriorYearStatsQuery(self, yearList, oneYearContribTemplate):
         """Generates the query for prior year stats.
@@ -487,40 +749,28 @@ class Statistician:
             stats["restrictedContributionsCount"] for k, stats in queryResults.items())
     
     def combineYears(self, yearlyQueryResults):
-        """Combines the individual yearly query results into the original query format.
-        Previously sending all as single query but had to split up due to rate limiting resource issues."""
-        yearlyQueryResults = [yr["data"]["user"] for yr in yearlyQueryResults]
-        self._contrib["commits"][1] = sum(
-            yr["contributionsCollection"]["totalCommitContributions"] for yr in yearlyQueryResults
-        )
-        self._contrib["reviews"][1] = sum(
-            yr["contributionsCollection"]["totalPullRequestReviewContributions"] for yr in yearlyQueryResults
-        )
-        self._contrib["private"][1] = sum(
-            yr["contributionsCollection"]["restrictedContributionsCount"] for yr in yearlyQueryResults
-        )
+        """Combines the individual yearly query results into the all-time
+        totals of commits, pull request reviews, and restricted contributions.
+        Previously sending all as single query but had to split up due to rate limiting resource issues.
+
+        Keyword arguments:
+        yearlyQueryResults - The list of the results of the yearly queries.
+        """
+        yearlyQueryResults = [yr["data"]["user"]["contributionsCollection"] for yr in yearlyQueryResults]
+        for key, field in [
+                ("commits", "totalCommitContributions"),
+                ("reviews", "totalPullRequestReviewContributions"),
+                ("private", "restrictedContributionsCount")]:
+            self._contrib[key] = [
+                self._contrib[key][0],
+                sum(yr[field] for yr in yearlyQueryResults)]
     
     def fetchTotalPullRequestReviews(self):
         """Queries the REST API for the total number of pull request reviews.
         """
-        if "GITHUB_REPOSITORY_OWNER" in os.environ:
-            owner = os.environ["GITHUB_REPOSITORY_OWNER"]
-        else:
-            print("Error (7): Could not determine the repository owner.")
-            set_outputs({"exit-code" : 7})
-            exit(7 if failOnError else 0)
-        arguments = [
-            'gh', 'api', '-X', 'GET', 'search/issues',
-            '-f', f"q=is:pr reviewed-by:{owner}",
-            '-f', "per_page=1", 
-            '--cache', '1h', 
-            '--jq', '.total_count'
-        ]
-        result = subprocess.run(
-            arguments,
-            stdout=subprocess.PIPE,
-            universal_newlines=True
-            ).stdout.strip()
+        owner = self.getOwner()
+        with tracer.span("search/issues"):
+            result = self.searchTotalCount("search/issues", f"is:pr reviewed-by:{owner}", owner)
         try:
             num_reviews = int(result)
             return num_reviews if num_reviews > 0 else None
@@ -531,71 +781,144 @@ class Statistician:
     def fetchTotalCommits(self):
         """Queries the REST API for the total number of commits.
         """
-        if "GITHUB_REPOSITORY_OWNER" in os.environ:
-            owner = os.environ["GITHUB_REPOSITORY_OWNER"]
-        else:
-            print("Error (7): Could not determine the repository owner.")
-            set_outputs({"exit-code" : 7})
-            exit(7 if failOnError else 0)
-        arguments = [
-            'gh', 'api', '-X', 'GET', 'search/commits', 
-            '-f', f"q=author:{owner}", 
-            '-f', "per_page=1", 
-            '--cache', '1h', 
-            '--jq', '.total_count'
-        ]
-        result = subprocess.run(
-            arguments,
-            stdout=subprocess.PIPE,
-            universal_newlines=True
-            ).stdout.strip()
+        owner = self.getOwner()
+        with tracer.span("search/commits"):
+            result = self.searchTotalCount("search/commits", f"author:{owner}", owner)
         try:
             num_commits = int(result)
             return num_commits if num_commits > 0 else None
         except ValueError:
             print(f"❌ For total commits, REST API returned: {result}.")
             return None
+
+    def searchTotalCount(self, endpoint, searchQuery, owner):
+        """Queries one of the REST API's search endpoints, and returns
+        the total_count of the results as a string, or if the response
+        doesn't have a total_count, the response itself as a string.
+        Uses the in-process client if available, and otherwise gh.
+        Counts are cached if the cache is enabled, and once expired
+        are revalidated with their ETag.
+
+        Keyword arguments:
+        endpoint - The search endpoint, such as search/commits.
+        searchQuery - The search query string.
+        owner - The login of the user queried.
+        """
+        timeToLive = _cacheTimeToLive.get(endpoint, _defaultTimeToLive)
+        entry = None
+        if self._cache != None:
+            key = self._cache.key(endpoint, searchQuery, owner)
+            entry = self._cache.get(key)
+            if entry != None and isFresh(entry):
+                return entry["response"]
+        if self._client != None:
+            try:
+                status, etag, response = self._client.restConditional(
+                    endpoint,
+                    {"q" : searchQuery, "per_page" : 1},
+                    entry["etag"] if entry != None else None)
+                if status == 304 and entry != None:
+                    self._cache.put(key, entry["response"], timeToLive, etag)
+                    return entry["response"]
+                if isinstance(response, dict) and "total_count" in response:
+                    result = str(response["total_count"])
+                    if self._cache != None:
+                        self._cache.put(key, result, timeToLive, etag)
+                    return result
+                return json.dumps(response)
+            except (TransientError, OSError, http.client.HTTPException, ValueError) as e:
+                print(f"WARNING: Request to {endpoint} failed ({e}), retrying with gh.")
+        arguments = [
+            'gh', 'api', '-X', 'GET', endpoint,
+            '-f', f"q={searchQuery}",
+            '-f', "per_page=1", 
+            '--cache', '1h', 
+            '--jq', '.total_count'
+        ]
+        def attempt():
+            self._rateLimiter.acquire("search")
+            result = self.runGh(arguments)
+            self._rateLimiter.recordCost("search")
+            if not result.isdigit() and isTransientOutput(result):
+                raise TransientError(f"{endpoint} returned: {result}", result=result)
+            return result
+        try:
+            result = self._retryPolicy.run(attempt)
+        except TransientError as e:
+            return e.result
+        if not result.isdigit():
+            # A permanent failure, such as a validation or authentication
+            # error, which isn't retried or cached.
+            return result
+        if self._cache != None:
+            self._cache.put(key, result, timeToLive)
+        return result
     
+    def executeCombinedQueries(self, queries, failOnError=True):
+        """Executes several queries of single objects of the user as one
+        combined query, in which each query's fields are aliased by its name.
+        If the combined query fails, it is split in half, and each half is
+        retried separately, until the failing queries are run on their own
+        with the usual handling of errors. Returns a dictionary mapping the
+        name of each query to its results (or None for an optional query
+        that failed).
+
+        Keyword arguments:
+        queries - A list of tuples, each with a query's name, the query as a
+            string, and a boolean that is True if the query is optional (see
+            executeOptionalQuery).
+        failOnError - If True, the workflow will fail if there is an error
+            executing a query that isn't optional.
+        """
+        if len(queries) == 1:
+            name, query, optional = queries[0]
+            if optional:
+                return {name : self.executeOptionalQuery(query, queryName=name)}
+            return {name : self.executeQuery(query, failOnError=failOnError, queryName=name)}
+        names = [name for name, query, optional in queries]
+        owner = self.getOwner(failOnError)
+        with tracer.span("combined", queries=names):
+            result = self.runGraphQLQuery(
+                combineQueries([(name, query) for name, query, optional in queries]),
+                owner,
+                queryName="combined")
+        if isCompleteCombinedResult(result, names):
+            return splitCombinedResult(result, names)
+        print("WARNING: Combined query of {0} failed, splitting it.".format(", ".join(names)))
+        half = len(queries) // 2
+        results = self.executeCombinedQueries(queries[:half], failOnError)
+        results.update(self.executeCombinedQueries(queries[half:], failOnError))
+        return results
+
     def executeOptionalQuery(self, query, queryName="Unnamed"):
-        """Executes a GitHub GraphQl query using the GitHub CLI (gh).
+        """Executes a GitHub GraphQl query.
         Does not fail the action if query fails.
 
         Keyword arguments:
         query - The query as a string.
         queryName - String for logging output if it fails.
         """
-        if "GITHUB_REPOSITORY_OWNER" in os.environ:
-            owner = os.environ["GITHUB_REPOSITORY_OWNER"]
-        else:
-            print("Error (7): Could not determine the repository owner.")
-            set_outputs({"exit-code" : 7})
-            exit(7 if failOnError else 0)
-        arguments = [
-            'gh', 'api', 'graphql',
-            '-F', 'owner=' + owner,
-            '--cache', '1h',
-            '-f', 'query=' + query
-            ]
-        result = subprocess.run(
-            arguments,
-            stdout=subprocess.PIPE,
-            universal_newlines=True
-            ).stdout.strip()
+        owner = self.getOwner()
+        with tracer.span(queryName):
+            result = self.runGraphQLQuery(query, owner, queryName=queryName)
+        if result == None:
+            return None
         if "errors" in result:
             print(f"WARNING GitHub API Returned GraphQL Errors for query {queryName}:")
-            result = json.loads(result)
-            for error in result["errors"]:
-                print(f"  - Message: {error.get('message')}")
-                print(f"  - Locations: {error.get('locations')}")
-                print(f"  - Type: {error.get('type')}")
+            self.printGraphQLErrors(result["errors"])
             return None
-        result = json.loads(result)
         if ("data" not in result) or (result["data"] == None):
             return None
         return result
         
-    def executeQuery(self, query, needsPagination=False, failOnError=True, queryName="Unnamed"):
-        """Executes a GitHub GraphQl query using the GitHub CLI (gh).
+    def executeQuery(
+        self,
+        query,
+        needsPagination=False,
+        failOnError=True,
+        queryName="Unnamed",
+        pageConsumer=None):
+        """Executes a GitHub GraphQl query.
 
         Keyword arguments:
         query - The query as a string.
@@ -603,70 +926,304 @@ class Statistician:
         failOnError - If True, the workflow will fail if there is an error executing the
             query; and if False, this action will quietly exit with no error code. In
             either case, an error message will be logged to the console.
+        queryName - String for logging output if it fails.
+        pageConsumer - If not None, a function that is passed each page of a paginated
+            query as soon as it arrives, in which case the pages are not retained and
+            this method returns None. Otherwise, the list of pages is returned. If the
+            function returns True, no further pages are fetched. Pages that are passed
+            to a pageConsumer are not cached, since caching them would retain them all.
         """
-        if "GITHUB_REPOSITORY_OWNER" in os.environ:
-            owner = os.environ["GITHUB_REPOSITORY_OWNER"]
-        else:
-            print("Error (7): Could not determine the repository owner.")
-            set_outputs({"exit-code" : 7})
-            exit(7 if failOnError else 0)
+        owner = self.getOwner(failOnError)
+        # The span includes the time the pageConsumer spends on the pages.
+        with tracer.span(queryName):
+            if needsPagination and pageConsumer != None:
+                pages = self.fetchGraphQLPages(query, owner)
+            elif needsPagination:
+                pages = self.iterGraphQLPages(query, owner, queryName)
+            else:
+                result = self.runGraphQLQuery(query, owner, queryName=queryName)
+                pages = iter([result] if result != None else [])
+            collected = []
+            isFirst = True
+            for page in pages:
+                self.checkPage(page, isFirst, queryName, failOnError)
+                isFirst = False
+                if pageConsumer == None:
+                    collected.append(page)
+                elif pageConsumer(page):
+                    pages.close()
+                    break
+            if isFirst:
+                self.checkPage(None, True, queryName, failOnError)
+        if not needsPagination:
+            return collected[0]
+        return collected if pageConsumer == None else None
+
+    def checkPage(self, page, isFirst, queryName, failOnError):
+        """Checks a page of query results for errors, exiting if there are any.
+        Only the first page must contain data.
+
+        Keyword arguments:
+        page - The parsed page of results, or None if nothing was returned.
+        isFirst - True if this is the first page.
+        queryName - String for logging output if it fails.
+        failOnError - If True, the workflow will fail if there is an error.
+        """
+        if page != None and "errors" in page:
+            print(f"❌ GitHub API Returned GraphQL Errors for query {queryName}:")
+            self.printGraphQLErrors(page["errors"])
+            sys.exit(1)
+        if not isFirst:
+            return
+        if page == None or "data" not in page:
+            print("Error (3): Something unexpected occurred during GitHub API query.")
+            if page != None and "message" in page:
+                print(page["message"])
+            set_outputs({"exit-code" : 3})
+            exit(3 if failOnError else 0)
+        if page["data"] == None:
+            print("Error (6): No data returned.")
+            set_outputs({"exit-code" : 6})
+            exit(6 if failOnError else 0)
+
+    def printGraphQLErrors(self, errors):
+        """Logs the errors from a GraphQL response.
+
+        Keyword arguments:
+        errors - The list of errors.
+        """
+        for error in errors:
+            print(f"  - Message: {error.get('message')}")
+            print(f"  - Locations: {error.get('locations')}")
+            print(f"  - Type: {error.get('type')}")
+
+    def runGraphQLQuery(self, query, owner, needsPagination=False, queryName="Unnamed"):
+        """Executes a GraphQL query and returns the parsed results (a list
+        of the pages if needsPagination is True), or None if nothing was
+        returned. Successful results are served from and stored in the
+        cache if the cache is enabled.
+
+        Keyword arguments:
+        query - The query as a string.
+        owner - The login of the user to query.
+        needsPagination - Pass True to enable pagination of query results.
+        queryName - The name of the query, which determines the cache's time to live.
+        """
+        if needsPagination:
+            pages = list(self.iterGraphQLPages(query, owner, queryName))
+            return pages if len(pages) > 0 else None
+        if self._cache != None:
+            key = self._cache.key("graphql", query, owner, {"paginate" : False})
+            result = self._cache.getFresh(key)
+            if result != None:
+                return result
+        result = self.fetchGraphQLQuery(query, owner)
+        if self._cache != None and isSuccessfulResult(result):
+            self._cache.put(
+                key,
+                result,
+                _cacheTimeToLive.get(queryName, _defaultTimeToLive))
+        return result
+
+    def iterGraphQLPages(self, query, owner, queryName="Unnamed"):
+        """Executes a paginated GraphQL query, yielding each parsed page
+        as soon as it arrives. Pages are served from the cache if the cache
+        is enabled and has them, and otherwise are retained only long enough
+        to store them in the cache once all have arrived.
+
+        Keyword arguments:
+        query - The query as a string. It must declare an $endCursor variable.
+        owner - The login of the user to query.
+        queryName - The name of the query, which determines the cache's time to live.
+        """
+        if self._cache != None:
+            key = self._cache.key("graphql", query, owner, {"paginate" : True})
+            pages = self._cache.getFresh(key)
+            if pages != None:
+                yield from pages
+                return
+            pages = []
+        for page in self.fetchGraphQLPages(query, owner):
+            if self._cache != None:
+                pages.append(page)
+            yield page
+        if self._cache != None and isSuccessfulResult(pages):
+            self._cache.put(
+                key,
+                pages,
+                _cacheTimeToLive.get(queryName, _defaultTimeToLive))
+
+    def fetchGraphQLQuery(self, query, owner):
+        """Executes a GraphQL query and returns the parsed results,
+        or None if nothing was returned. Uses the in-process client if
+        available, and otherwise falls back to the GitHub CLI (gh).
+
+        Keyword arguments:
+        query - The query as a string.
+        owner - The login of the user to query.
+        """
+        if self._client != None:
+            try:
+                return self._client.graphql(query, {"owner" : owner})
+            except (TransientError, OSError, http.client.HTTPException, ValueError) as e:
+                print(f"WARNING: GraphQL request failed ({e}), retrying with gh.")
+        def attempt():
+            self._rateLimiter.acquire("graphql")
+            result, errors = self.runGhWithErrors([
+                'gh', 'api', 'graphql',
+                '-F', 'owner=' + owner,
+                '--cache', '1h',
+                '-f', 'query=' + query
+                ])
+            if len(result) == 0:
+                # gh writes nothing to stdout on permanent failures, such as
+                # authentication errors, which aren't retried.
+                if isTransientOutput(errors):
+                    raise TransientError(f"gh failed: {errors}")
+                return None
+            result = json.loads(result)
+            self._rateLimiter.recordGraphQL(result)
+            if hasTransientErrors(result):
+                raise TransientError("GraphQL query failed with transient errors", result=result)
+            return result
+        try:
+            return self._retryPolicy.run(attempt)
+        except TransientError as e:
+            return e.result
+
+    def fetchGraphQLPages(self, query, owner):
+        """Executes a paginated GraphQL query, yielding each parsed page
+        as soon as it arrives. Uses the in-process client if available,
+        and otherwise falls back to the GitHub CLI (gh), whose output is
+        decoded incrementally from the pipe. If the client fails part way
+        through, gh resumes from the endCursor of the last page the client
+        yielded, since the client's page size may differ from gh's. If gh
+        itself fails transiently, it is retried from the same cursor,
+        skipping the pages it already yielded.
+
+        Keyword arguments:
+        query - The query as a string. It must declare an $endCursor variable.
+        owner - The login of the user to query.
+        """
+        endCursor = None
+        if self._client != None:
+            try:
+                for page in self._client.graphqlPages(query, {"owner" : owner}):
+                    pageInfo = findPageInfo(page.get("data"))
+                    if pageInfo != None:
+                        endCursor = pageInfo.get("endCursor")
+                    yield page
+                return
+            except (TransientError, OSError, http.client.HTTPException, ValueError) as e:
+                print(f"WARNING: GraphQL request failed ({e}), retrying with gh.")
         arguments = [
             'gh', 'api', 'graphql',
             '-F', 'owner=' + owner,
+            '--paginate',
             '--cache', '1h',
             '-f', 'query=' + query
             ]
-        if needsPagination:
-            arguments.insert(5, '--paginate')
-        result = subprocess.run(
+        if endCursor != None:
+            arguments.extend(['-f', 'endCursor=' + endCursor])
+        numYielded = 0
+        self.ghConfigure()
+        startTime = time.monotonic()
+        attempt = 1
+        while True:
+            self._rateLimiter.acquire("graphql")
+            # gh's stderr is collected in a file, rather than a pipe that
+            # could fill while its stdout is being read.
+            stderr = tempfile.TemporaryFile(mode="w+")
+            process = subprocess.Popen(
+                arguments,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                universal_newlines=True
+                )
+            error = None
+            try:
+                for i, page in enumerate(decodeConcatenatedPages(process.stdout)):
+                    self._rateLimiter.recordGraphQL(page)
+                    if hasTransientErrors(page):
+                        error = TransientError("GraphQL query failed with transient errors", result=page)
+                        break
+                    if i >= numYielded:
+                        numYielded += 1
+                        yield page
+            finally:
+                process.stdout.close()
+                if process.poll() == None:
+                    process.kill()
+                process.wait()
+                stderr.seek(0)
+                errors = echoErrors(stderr.read())
+                stderr.close()
+            if error == None and numYielded == 0 and isTransientOutput(errors):
+                error = TransientError(f"gh failed: {errors}")
+            if error == None:
+                return
+            # Retry, resuming after the pages already yielded.
+            if not self._retryPolicy.backoff(attempt, startTime, error):
+                if error.result != None:
+                    yield error.result
+                return
+            attempt += 1
+
+    def getOwner(self, failOnError=True):
+        """Gets the login of the user whose stats are queried.
+
+        Keyword arguments:
+        failOnError - If True, the workflow will fail if the owner can't be
+            determined; and if False, this action will quietly exit with no error code.
+        """
+        if self._owner != None:
+            return self._owner
+        if "GITHUB_REPOSITORY_OWNER" in os.environ:
+            return os.environ["GITHUB_REPOSITORY_OWNER"]
+        print("Error (7): Could not determine the repository owner.")
+        set_outputs({"exit-code" : 7})
+        exit(7 if failOnError else 0)
+
+    def ghConfigure(self):
+        """Disables gh's interactive prompts the first time gh is used.
+        """
+        with self._ghLock:
+            if not self._ghConfigured:
+                with tracer.span("gh config"):
+                    self.ghDisableInteractivePrompts()
+                self._ghConfigured = True
+
+    def runGh(self, arguments):
+        """Runs a GitHub CLI (gh) command and returns its output,
+        disabling gh's interactive prompts first if that hasn't been
+        done yet.
+
+        Keyword arguments:
+        arguments - The command's arguments.
+        """
+        self.ghConfigure()
+        return subprocess.run(
             arguments,
             stdout=subprocess.PIPE,
             universal_newlines=True
             ).stdout.strip()
-        if "errors" in result:
-            print(f"❌ GitHub API Returned GraphQL Errors for query {queryName}:")
-            result = json.loads(result)
-            for error in result["errors"]:
-                print(f"  - Message: {error.get('message')}")
-                print(f"  - Locations: {error.get('locations')}")
-                print(f"  - Type: {error.get('type')}")
-            sys.exit(1)
-        numPages = result.count('"data"')
-        if numPages == 0:
-            # Check if any error details
-            result = json.loads(result) if len(result) > 0 else ""
-            if "errors" in result:
-                print("Error (2): GitHub api Query failed with error:")
-                print(result["errors"])
-                code = 2
-            else:
-                print("Error (3): Something unexpected occurred during GitHub API query.")
-                code = 3
-            set_outputs({"exit-code" : code})
-            exit(code if failOnError else 0)
-        elif needsPagination:
-            if (numPages > 1):
-                result = result.replace('}{"data"', '},{"data"')
-            result = "[" + result + "]"
-        result = json.loads(result)
-        failed = False
-        errorMessage = None
-        if ((not needsPagination) and
-            (("data" not in result) or result["data"] == None)):
-            failed = True
-            if "errors" in result:
-                errorMessage = result["errors"]
-        elif needsPagination and ("data" not in result[0] or result[0]["data"] == None):
-            failed = True
-            if "errors" in result[0] :
-                errorMessage = result[0]["errors"]
-        if failed:
-            print("Error (6): No data returned.")
-            if errorMessage != None:
-                print(errorMessage)
-            set_outputs({"exit-code" : 6})
-            exit(6 if failOnError else 0)
-        return result
+
+    def runGhWithErrors(self, arguments):
+        """Runs a GitHub CLI (gh) command and returns a tuple with its
+        output and its error output, which is also logged, disabling gh's
+        interactive prompts first if that hasn't been done yet.
+
+        Keyword arguments:
+        arguments - The command's arguments.
+        """
+        self.ghConfigure()
+        result = subprocess.run(
+            arguments,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True
+            )
+        return result.stdout.strip(), echoErrors(result.stderr)
 
     def ghDisableInteractivePrompts(self):
         """Disable gh's interactive prompts. This is probably unnecessary,
@@ -680,4 +1237,3 @@ class Statistician:
             stdout=subprocess.PIPE,
             universal_newlines=True
             ).stdout.strip()
-    
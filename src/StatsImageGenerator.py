@@ -25,12 +25,20 @@
 # SOFTWARE.
 #
 
-from StatConfig import statsByCategory, loadLocale, icons
+from StatConfig import statsByCategory, loadLocale, loadLabelWidths, icons
 from PieChart import svgPieChart
 from Colors import iconTemplates
 from ColorUtil import highContrastingColor
-from TextLength import calculateTextLength, calculateTextLength110Weighted
+from TextLength import calculateTextLength, calculateTextLength110Weighted, calculateTextLength110, scaleTextLength110, weightTextLength110
 import math
+import io
+
+# The id of the symbol of each stat's icon, which is the key of the first
+# stat with an identical icon (e.g., followers and following share one),
+# so that each distinct icon is defined once in an image.
+_iconIds = {
+    key : next(k for k, other in icons.items() if other == icon)
+    for key, icon in icons.items() }
 
 class StatsImageGenerator:
     """Generates an svg image from the collected stats."""
@@ -46,39 +54,45 @@ class StatsImageGenerator:
 <text lengthAdjust="spacingAndGlyphs" textLength="{8}" x="{5}" y="{3}">{4}</text>
 <text lengthAdjust="spacingAndGlyphs" textLength="{9}" x="{7}" y="{3}">{6}</text>
 <text lengthAdjust="spacingAndGlyphs" textLength="{12}" x="{11}" y="{3}">{10}</text>
-</g></g>"""
+</g></g>""".replace("\n", "")
     tableEntryTemplateOneColumn = """<g transform="translate(15, {0})">
 {1}
 <g transform="scale({2})">
 <text lengthAdjust="spacingAndGlyphs" textLength="{8}" x="{5}" y="{3}">{4}</text>
 <text lengthAdjust="spacingAndGlyphs" textLength="{9}" x="{7}" y="{3}">{6}</text>
-</g></g>"""
+</g></g>""".replace("\n", "")
     tableHeaderTemplate = """<g transform="translate(15, 0)">
 <g transform="scale({0})">
 <text x="0" y="{1}" textLength="{3}" lengthAdjust="spacingAndGlyphs">{2}</text>
 <text x="{5}" y="{1}" textLength="{6}" lengthAdjust="spacingAndGlyphs">{4}</text>
 <text x="{8}" y="{1}" textLength="{9}" lengthAdjust="spacingAndGlyphs">{7}</text>
-</g></g>"""
+</g></g>""".replace("\n", "")
     tableHeaderTemplateOneColumn = """<g transform="translate(15, 0)">
 <g transform="scale({0})">
 <text x="0" y="{1}" textLength="{3}" lengthAdjust="spacingAndGlyphs">{2}</text>
 <text x="{5}" y="{1}" textLength="{6}" lengthAdjust="spacingAndGlyphs">{4}</text>
-</g></g>"""
+</g></g>""".replace("\n", "")
     tableHeaderTemplateNoColumns = """<g transform="translate(15, 0)">
 <g transform="scale({0})">
 <text x="0" y="{1}" textLength="{3}" lengthAdjust="spacingAndGlyphs">{2}</text>
-</g></g>"""
+</g></g>""".replace("\n", "")
     languageEntryTemplate = """<g transform="translate(15, {0})">
 <rect x="0.5" y="0.5" rx="2" width="15" height="15" fill="{1}" stroke-width="1" stroke="{2}"/>
 <text transform="scale({4})" x="{5}" y="{6}" textLength="{7}" lengthAdjust="spacingAndGlyphs">{3}</text>
-</g>"""
+</g>""".replace("\n", "")
     languageEntryTemplateTwoLangs = """<g transform="translate(15, {0})">
 <rect x="0.5" y="0.5" rx="2" width="15" height="15" fill="{1}" stroke-width="1" stroke="{2}"/>
 <text transform="scale({4})" x="{5}" y="{6}" textLength="{7}" lengthAdjust="spacingAndGlyphs">{3}</text>
 <rect x="{9}" y="0.5" rx="2" width="15" height="15" fill="{8}" stroke-width="1" stroke="{2}"/>
 <text transform="scale({4})" x="{11}" y="{6}" textLength="{12}" lengthAdjust="spacingAndGlyphs">{10}</text>
-</g>"""
+</g>""".replace("\n", "")
     languageStringTemplate = "{0} {1:.2f}%"
+    definitionsTemplate = '<defs>{0}</defs>'
+    iconStyleTemplate = '<style>.i{{fill:{0}}}</style>'
+    iconSymbolTemplate = '<symbol id="{0}" viewBox="0 0 16 16">{1}</symbol>'
+    iconUseTemplate = '<use class="i" href="#{0}" width="16" height="16"/>'
+    titleIconSymbolTemplate = '<symbol id="title-icon">{0}</symbol>'
+    titleIconUseTemplate = '<use href="#title-icon" x="{0}" y="{1}"/>'
     pieTransform = """<g transform="translate({2}, {1})">{0}</g>"""
     pieContrast = """<g transform="translate({3}, {1})"><circle cx="{0}" cy="{0}" r="{0}" fill="{2}"/></g>"""
     
@@ -87,7 +101,7 @@ class StatsImageGenerator:
         '_colors',
         '_height',
         '_width',
-        '_rows',
+        '_sink',
         '_lineHeight',
         '_margin',
         '_locale',
@@ -104,7 +118,8 @@ class StatsImageGenerator:
         '_title',
         '_includeTitle',
         '_exclude',
-        '_topIconSize'
+        '_topIconSize',
+        '_labelWidths'
         ]
 
     def __init__(self,
@@ -119,7 +134,9 @@ class StatsImageGenerator:
                  width,
                  customTitle,
                  includeTitle,
-                 exclude):
+                 exclude,
+                 labels=None,
+                 labelWidths=None):
         """Initializes the StatsImageGenerator.
 
         Keyword arguments:
@@ -140,12 +157,18 @@ class StatsImageGenerator:
             title is formed from user's name.
         includeTitle - If True inserts a title.
         exclude - A set of keys to exclude.
+        labels - The already loaded labels of the locale, or None
+            to load them.
+        labelWidths - The already loaded precomputed lengths of the
+            labels of the locale (see StatConfig.loadLabelWidths), or
+            None to load them.
         """
         self._stats = stats
         self._colors = colors
         self._highContrast = highContrastingColor(self._colors["bg"])
         self._locale = locale
-        self._labels = loadLocale(self._locale)
+        self._labels = labels if labels != None else loadLocale(self._locale)
+        self._labelWidths = labelWidths if labelWidths != None else loadLabelWidths(self._locale)
         self._radius = radius
         self._titleSize = titleSize
         if customTitle != None:
@@ -170,11 +193,7 @@ class StatsImageGenerator:
         self._pieRadius = (
             ((self._width // 2 - 2*self._margin) // self._lineHeight * self._lineHeight) - (
                 self._lineHeight - 16)) // 2 
-        self._rows = [
-            StatsImageGenerator.headerTemplate,
-            StatsImageGenerator.backgroundTemplate,
-            StatsImageGenerator.fontGroup
-            ]
+        self._sink = None
 
     def calculateMinimumFeasibleWidth(self):
         """Calculates the minimum feasible width for the
@@ -193,8 +212,8 @@ class StatsImageGenerator:
                 if category == "languages":
                     languageData = self._stats.getStatsByKey(category)
                     if languageData["totalSize"] > 0:
-                        headingRowLength = calculateTextLength(
-                            self._labels["categoryLabels"][category]["heading"],
+                        headingRowLength = scaleTextLength110(
+                            self.labelLength110(self._labels["categoryLabels"][category]["heading"]),
                             14,
                             True,
                             600)
@@ -222,8 +241,8 @@ class StatsImageGenerator:
                         )
                     if len(keys) > 0:
                         headerRow = self._labels["categoryLabels"][category]
-                        headingRowLength = calculateTextLength(
-                            headerRow["heading"],
+                        headingRowLength = scaleTextLength110(
+                            self.labelLength110(headerRow["heading"]),
                             14,
                             True,
                             600)
@@ -234,8 +253,8 @@ class StatsImageGenerator:
                         if headerRow["column-one"] != None:
                             length = max(
                                 length,
-                                4*(self._margin + calculateTextLength(
-                                    headerRow["column-one"],
+                                4*(self._margin + scaleTextLength110(
+                                    self.labelLength110(headerRow["column-one"]),
                                     14,
                                     True,
                                     600))
@@ -243,16 +262,16 @@ class StatsImageGenerator:
                         if headerRow["column-two"] != None:
                             length = max(
                                 length,
-                                4*(self._margin + calculateTextLength(
-                                    headerRow["column-two"],
+                                4*(self._margin + scaleTextLength110(
+                                    self.labelLength110(headerRow["column-two"]),
                                     14,
                                     True,
                                     600))
                                 )
                         data = self._stats.getStatsByKey(category)
                         for k in keys:
-                            labelLength = calculateTextLength(
-                                self._labels["statLabels"][k],
+                            labelLength = scaleTextLength110(
+                                self.labelLength110(self._labels["statLabels"][k]),
                                 14,
                                 True,
                                 600)
@@ -272,8 +291,51 @@ class StatsImageGenerator:
                                     )
         return math.ceil(length)
 
+    def calculateHeight(self):
+        """Calculates the height of the SVG from the stats that are
+        to be included, which the opening tags of the image need before
+        the rest of the image is generated.
+        """
+        height = 39 if self._includeTitle else 0
+        for category in self._categoryOrder:
+            if category not in self._exclude:
+                data = self._stats.getStatsByKey(category)
+                if category == "languages":
+                    if data["totalSize"] > 0:
+                        numLanguages = len(data["languages"])
+                        diameter = self._pieRadius * 2
+                        numRowsToLeft = min(round(diameter / self._lineHeight), numLanguages)
+                        # The heading, the languages to the left of the pie chart,
+                        # and the rest of the languages two per row.
+                        offset = self._lineHeight * (
+                            1 + numRowsToLeft + (numLanguages - numRowsToLeft + 1) // 2)
+                        height += self._lineHeight + max(
+                            offset,
+                            diameter + self._lineHeight + self._lineHeight - self._margin - 1)
+                else:
+                    keys = self.filterKeys(data, statsByCategory[category])
+                    if len(keys) > 0:
+                        headerRow = self._labels["categoryLabels"][category]
+                        height += self._lineHeight * (
+                            len(keys) + (2 if headerRow != None else 1))
+        return height + self._lineHeight
+
     def generateImage(self):
         """Generates and returns the image."""
+        image = io.BytesIO()
+        self.writeImage(image)
+        return image.getvalue().decode(encoding="UTF-8")
+
+    def writeImage(self, sink):
+        """Generates the image, writing it to a binary file or stream,
+        encoded as UTF-8, as it is generated.
+
+        Keyword arguments:
+        sink - A binary file or stream, such as a file opened in mode "wb".
+        """
+        self._sink = sink
+        self._height = 0
+        self.insertHeader(self.calculateHeight())
         self.insertTitle()
         for category in self._categoryOrder:
             if category not in self._exclude:
@@ -292,7 +354,83 @@ class StatsImageGenerator:
                             )
                         )
         self.finalizeImageData()
-        return "".join(self._rows).replace("\n", "")
+        self._sink = None
+
+    def emit(self, chunk):
+        """Writes a chunk of the image to the sink, without newlines.
+        The templates have none, but the text of the stats might.
+
+        Keyword arguments:
+        chunk - A string with part of the image.
+        """
+        if "\n" in chunk:
+            chunk = chunk.replace("\n", "")
+        self._sink.write(chunk.encode(encoding="UTF-8"))
+
+    def insertHeader(self, height):
+        """Inserts the svg opening tag, the rect for the background,
+        and the opening tag of the group of text.
+
+        Keyword arguments:
+        height - The height of the SVG.
+        """
+        self.emit(StatsImageGenerator.headerTemplate.format(
+            str(height), str(self._width), self._locale))
+        self.emit(StatsImageGenerator.backgroundTemplate.format(
+            str(height - 4),
+            self._colors["border"],
+            self._colors["bg"],
+            str(self._width - 4),
+            self._radius
+            ))
+        self.insertDefinitions()
+        self.emit(StatsImageGenerator.fontGroup)
+
+    def insertDefinitions(self):
+        """Inserts the definitions of the icons that the image includes,
+        each distinct icon once as a symbol, which the rows of the stats
+        and the title reference. The color of the icons of the stats is
+        applied by a style rule rather than to each icon.
+        """
+        definitions = []
+        if self._includeTitle and "title-icon" in self._colors:
+            definitions.append(StatsImageGenerator.titleIconSymbolTemplate.format(
+                iconTemplates[self._colors["title-icon"]].format(
+                    self._topIconSize,
+                    0,
+                    0,
+                    self._highContrast
+                    )
+                ))
+        iconIds = []
+        for category in self._categoryOrder:
+            if category not in self._exclude and category != "languages":
+                for k in self.filterKeys(
+                    self._stats.getStatsByKey(category),
+                    statsByCategory[category]):
+                    if _iconIds[k] not in iconIds:
+                        iconIds.append(_iconIds[k])
+        if len(iconIds) > 0:
+            definitions.append(
+                StatsImageGenerator.iconStyleTemplate.format(self._colors["icons"]))
+            for iconId in iconIds:
+                definitions.append(StatsImageGenerator.iconSymbolTemplate.format(
+                    iconId,
+                    icons[iconId].replace(' fill="{0}"', "")
+                    ))
+        if len(definitions) > 0:
+            self.emit(StatsImageGenerator.definitionsTemplate.format("".join(definitions)))
+
+    def labelLength110(self, label):
+        """Gets the length of a label of the locale in DejaVu Sans 110pt
+        font, from the precomputed lengths if it is among them, and
+        otherwise by measuring it.
+
+        Keyword arguments:
+        label - The label.
+        """
+        length = self._labelWidths.get(label)
+        return length if length != None else calculateTextLength110(label)
 
     def filterKeys(self, data, keys):
         """Returns a list of the keys that have non-zero data and which are not excluded.
@@ -324,7 +462,7 @@ class StatsImageGenerator:
         if self._includeTitle:
             scale = round(0.75 * self._titleSize / 110, 3)
             titleTextLength = round(calculateTextLength110Weighted(self._title, 600))
-            self._rows.append(
+            self.emit(
                 StatsImageGenerator.titleTemplate.format(
                     self._title,
                     self._colors["title"],
@@ -335,21 +473,16 @@ class StatsImageGenerator:
                 )
             )
             if "title-icon" in self._colors:
-                icon = iconTemplates[self._colors["title-icon"]]
-                self._rows.append(
-                    icon.format(
-                        self._topIconSize,
-                        self._margin,
+                self.emit(
+                    StatsImageGenerator.titleIconUseTemplate.format(
                         self._margin,
-                        self._highContrast
+                        self._margin
                     )
                 )
-                self._rows.append(
-                    icon.format(
-                        self._topIconSize,
+                self.emit(
+                    StatsImageGenerator.titleIconUseTemplate.format(
                         self._width - self._margin - self._topIconSize,
-                        self._margin,
-                        self._highContrast
+                        self._margin
                     )
                 )
             self._height += 39
@@ -369,7 +502,7 @@ class StatsImageGenerator:
         if len(keys) > 0:
             scale = round(0.75 * 14 / 110, 3)
             self._height += self._lineHeight
-            self._rows.append(
+            self.emit(
                 StatsImageGenerator.groupHeaderTemplate.format(
                     self._height,
                     self._colors["text"]))
@@ -380,17 +513,17 @@ class StatsImageGenerator:
                     template = StatsImageGenerator.tableHeaderTemplateOneColumn
                 else:
                     template = StatsImageGenerator.tableHeaderTemplate
-                self._rows.append(template.format(
+                self.emit(template.format(
                     "{0:.3f}".format(scale),
                     str(round(12.5/scale)),
                     headerRow["heading"],
-                    round(calculateTextLength110Weighted(headerRow["heading"], 600)),
+                    round(weightTextLength110(self.labelLength110(headerRow["heading"]), 600)),
                     headerRow["column-one"],
                     str(round(self._firstColX/scale)),
-                    round(calculateTextLength110Weighted(headerRow["column-one"], 600)),
+                    round(weightTextLength110(self.labelLength110(headerRow["column-one"]), 600)),
                     headerRow["column-two"],
                     str(round(self._secondColX/scale)),
-                    round(calculateTextLength110Weighted(headerRow["column-two"], 600))
+                    round(weightTextLength110(self.labelLength110(headerRow["column-two"]), 600))
                     ))
                 offset = self._lineHeight
             else:
@@ -401,23 +534,23 @@ class StatsImageGenerator:
                 label = self._labels["statLabels"][k]
                 data1 = str(self.formatCount(data[k][0]))
                 data2 = str(self.formatCount(data[k][1])) if len(data[k]) > 1 else ""
-                self._rows.append(template.format(
+                self.emit(template.format(
                     str(offset),
-                    icons[k].format(self._colors["icons"]),
+                    StatsImageGenerator.iconUseTemplate.format(_iconIds[k]),
                     "{0:.3f}".format(scale),
                     str(round(12.5/scale)),
                     label,
                     str(round(25/scale)),
                     data1,
                     str(round(self._firstColX/scale)),
-                    round(calculateTextLength110Weighted(label, 600)),
+                    round(weightTextLength110(self.labelLength110(label), 600)),
                     round(calculateTextLength110Weighted(data1, 600)),
                     data2,
                     str(round(self._secondColX/scale)),
                     round(calculateTextLength110Weighted(data2, 600))
                     ))
                 offset += self._lineHeight
-            self._rows.append("</g>")
+            self.emit("</g>")
             self._height += offset
 
     def insertLanguagesChart(self, languageData, categoryHeading):
@@ -431,22 +564,22 @@ class StatsImageGenerator:
         if languageData["totalSize"] > 0:
             scale = round(0.75 * 14 / 110, 3)
             self._height += self._lineHeight
-            self._rows.append(
+            self.emit(
                 StatsImageGenerator.groupHeaderTemplate.format(
                     self._height,
                     self._colors["text"]
                     )
                 )
-            self._rows.append(
+            self.emit(
                 StatsImageGenerator.tableHeaderTemplateNoColumns.format(
                     "{0:.3f}".format(scale),
                     str(round(12.5/scale)),
                     categoryHeading,
-                    round(calculateTextLength110Weighted(categoryHeading, 600))
+                    round(weightTextLength110(self.labelLength110(categoryHeading), 600))
                     )
                 )
             offset = self._lineHeight
-            self._rows.append(
+            self.emit(
                 StatsImageGenerator.pieContrast.format(
                     self._pieRadius,
                     str(offset),
@@ -454,7 +587,7 @@ class StatsImageGenerator:
                     self._firstColX + self._margin
                     )
                 )
-            self._rows.append(
+            self.emit(
                 StatsImageGenerator.pieTransform.format(
                     svgPieChart(
                         [L[1] for L in languageData["languages"]],
@@ -474,7 +607,7 @@ class StatsImageGenerator:
                         L[0],
                         100 * L[1]["percentage"]
                         )
-                    self._rows.append(
+                    self.emit(
                         StatsImageGenerator.languageEntryTemplate.format(
                             str(offset),
                             L[1]["color"],
@@ -501,7 +634,7 @@ class StatsImageGenerator:
                         L2[0],
                         100 * L2[1]["percentage"]
                         )
-                    self._rows.append(
+                    self.emit(
                         StatsImageGenerator.languageEntryTemplateTwoLangs.format(
                             str(offset),
                             L[1]["color"],
@@ -520,7 +653,7 @@ class StatsImageGenerator:
                         )
                     offset += self._lineHeight
                 else:
-                    self._rows.append(
+                    self.emit(
                         StatsImageGenerator.languageEntryTemplate.format(
                             str(offset),
                             L[1]["color"],
@@ -533,7 +666,7 @@ class StatsImageGenerator:
                             )
                         )
                     offset += self._lineHeight
-            self._rows.append("</g>")
+            self.emit("</g>")
             if diameter + self._lineHeight + self._lineHeight - self._margin - 1 <= offset:
                 self._height += offset
             else:
@@ -554,19 +687,9 @@ class StatsImageGenerator:
             return "{0:.1f}M".format(count // 100000 * 100000 / 1000000)
         
     def finalizeImageData(self):
-        """Inserts the height into the svg opening tag and the rect for the background.
-        Also inserts the border and background colors into the rect for the background.
-        Must be called after generating the rest of the image since we won't know
-        height until the end.  Also inserts closing tags.
+        """Inserts the closing tags. The height, which the opening tags
+        already include (see calculateHeight), is complete once the rest
+        of the image is generated.
         """
         self._height += self._lineHeight
-        self._rows[0] = self._rows[0].format(str(self._height), str(self._width), self._locale)
-        self._rows[1] = self._rows[1].format(
-            str(self._height - 4),
-            self._colors["border"],
-            self._colors["bg"],
-            str(self._width - 4),
-            self._radius
-            )
-        self._rows.append("</g>\n</svg>\n")
-        
+        self.emit("</g></svg>")
@@ -0,0 +1,124 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+class Tracer:
+    """Records timed spans of the phases of a run, such as each query,
+    parsing, layout, rendering, writing the image, and each step of the
+    commit and push, as Chrome trace events (viewable in chrome://tracing
+    or Perfetto). Spans may be recorded concurrently from multiple threads,
+    each of which appears as its own track. The durations of the top-level
+    phases are also totaled by name, for reporting as action outputs.
+    """
+
+    __slots__ = [
+        '_lock',
+        '_events',
+        '_totals',
+        '_origin',
+        '_clock'
+        ]
+
+    def __init__(self, clock=time.perf_counter):
+        """Initializes the tracer.
+
+        Keyword arguments:
+        clock - The function that returns the current time in seconds.
+        """
+        self._lock = threading.Lock()
+        self._events = []
+        self._totals = {}
+        self._clock = clock
+        self._origin = clock()
+
+    @contextmanager
+    def span(self, name, phase=False, **args):
+        """Records the duration of the code within a with statement as a span.
+
+        Keyword arguments:
+        name - The name of the span.
+        phase - If True, the span is a top-level phase of the run, whose
+            duration is added to the total of its name.
+        args - Additional details of the span to include in the trace.
+        """
+        start = self._clock()
+        try:
+            yield
+        finally:
+            end = self._clock()
+            event = {
+                "name" : name,
+                "cat" : "phase" if phase else "span",
+                "ph" : "X",
+                "ts" : round((start - self._origin) * 1000000),
+                "dur" : round((end - start) * 1000000),
+                "pid" : os.getpid(),
+                "tid" : threading.get_ident()
+            }
+            if len(args) > 0:
+                event["args"] = args
+            with self._lock:
+                self._events.append(event)
+                if phase:
+                    self._totals[name] = self._totals.get(name, 0) + end - start
+
+    def events(self):
+        """Gets the list of the trace events recorded so far, in the order
+        in which the spans ended.
+        """
+        with self._lock:
+            return list(self._events)
+
+    def totals(self):
+        """Gets a dictionary mapping the name of each top-level phase to
+        its total duration in seconds, rounded to milliseconds.
+        """
+        with self._lock:
+            return { name : round(seconds, 3) for name, seconds in self._totals.items() }
+
+    def writeTrace(self, filename):
+        """Writes the trace events to a file in the Chrome trace event
+        format, creating any missing directories from the path.
+
+        Keyword arguments:
+        filename - The filename for the trace, with complete path.
+        """
+        directoryName = os.path.dirname(filename)
+        if len(directoryName) > 0:
+            os.makedirs(directoryName, exist_ok=True)
+        with open(filename, "w") as f:
+            json.dump(
+                {"traceEvents" : self.events(), "displayTimeUnit" : "ms"},
+                f)
+
+# The tracer of the run, shared by all modules.
+tracer = Tracer()
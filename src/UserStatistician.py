@@ -29,9 +29,16 @@
 from Statistician import Statistician, set_outputs
 from Colors import colorMapping, iconTemplates
 from StatsImageGenerator import StatsImageGenerator
-from StatConfig import supportedLocales, categoryOrder
+from StatConfig import supportedLocales, categoryOrder, loadLocale, loadLabelWidths
+from GitHubClient import GitHubClient
+from ResponseCache import ResponseCache
+from RateLimiter import RateLimiter
+from RetryPolicy import RetryPolicy
+from QueryPlanner import QueryPlan
+from Tracer import tracer
 import sys
 import os
+import json
 import subprocess
 
 def writeImageToFile(filename, image, failOnError):
@@ -40,7 +47,9 @@ def writeImageToFile(filename, image, failOnError):
 
     Keyword arguments:
     filename - The filename for the image, with complete path.
-    image - A string containing the image.
+    image - A string containing the image, or a function that writes
+        the image to a binary file, such as the writeImage method of
+        a StatsImageGenerator.
     failOnError - If True, the workflow will fail if there is an error
         writing the image to a file; and if False, this action will quietly
         exit with no error code. In either case, an error message will be
@@ -57,8 +66,10 @@ def writeImageToFile(filename, image, failOnError):
     try:
         # Write the image to a file
         with open(filename, "wb") as file:
-            image = image.encode(encoding="UTF-8")
-            file.write(image)
+            if isinstance(image, str):
+                file.write(image.encode(encoding="UTF-8"))
+            else:
+                image(file)
     except IOError:
         print("Error (4): An error occurred while writing the image to a file.")
         set_outputs({"exit-code" : 4})
@@ -70,23 +81,27 @@ def executeCommand(arguments):
     Keyword arguments:
     arguments - The arguments for the command.
     """
-    result = subprocess.run(
-        arguments,
-        stdout=subprocess.PIPE,
-        universal_newlines=True
-        )
+    # Only the command and subcommand name the span, since the
+    # remaining arguments may include the token.
+    with tracer.span(" ".join(arguments[:2])):
+        result = subprocess.run(
+            arguments,
+            stdout=subprocess.PIPE,
+            universal_newlines=True
+            )
     return result.stdout.strip(), result.returncode
 
 def commitAndPush(filename, name, login, failOnError, commit_message):
     """Commits and pushes the image.
 
     Keyword arguments:
-    filename - The path to the image.
+    filename - The path to the image, or a list of the paths to the images.
     name - The user's name.
     login - The user's login id.
     failOnError - Boolean controlling whether or not to fail the run if an error occurs.
     commit_message - Message for the commit
     """
+    filenames = [filename] if isinstance(filename, str) else filename
     # Resolve issue related to user in Docker container vs owner of repository
     executeCommand(
         ["git", "config", "--global", "--add", "safe.directory", "/github/workspace"])
@@ -96,7 +111,7 @@ def commitAndPush(filename, name, login, failOnError, commit_message):
     if result[1] == 0:
         # Check if the image changed
         result = executeCommand(
-            ["git", "status", "--porcelain", filename])
+            ["git", "status", "--porcelain"] + filenames)
         if len(result[0]) > 0:
             # Commit and push
             executeCommand(
@@ -104,10 +119,10 @@ def commitAndPush(filename, name, login, failOnError, commit_message):
             executeCommand(
                 ["git", "config", "--global", "user.email",
                  login + '@users.noreply.github.com'])
-            executeCommand(["git", "add", filename])
+            executeCommand(["git", "add"] + filenames)
             executeCommand(["git", "commit", "-m",
-                            commit_message,
-                           filename])
+                            commit_message] +
+                           filenames)
             # START FIX for checkout@v6
             r = executeCommand(["git",
                                 "remote",
@@ -137,6 +152,33 @@ def canonicalize_locale(locale):
             return x
     return "en"
 
+def parseUsers(users, imageFilenameWithPath):
+    """Parses the list of users for batch mode, returning a list of
+    tuples of each user's login and the path to the user's image.
+    Each entry of the list is either a login, or a login and a path
+    separated by an equals sign. The image of a user without a path
+    is written to the image-file path with {login} replaced by the
+    login, or if it has no {login}, to a directory named for the login
+    within the directory of the image-file path.
+
+    Keyword arguments:
+    users - The list of users, separated by commas or whitespace.
+    imageFilenameWithPath - The path from the image-file input.
+    """
+    parsed = []
+    for entry in users.replace(",", " ").split():
+        login, separator, filename = entry.partition("=")
+        if len(filename) == 0:
+            if "{login}" in imageFilenameWithPath:
+                filename = imageFilenameWithPath.replace("{login}", login)
+            else:
+                filename = os.path.join(
+                    os.path.dirname(imageFilenameWithPath),
+                    login,
+                    os.path.basename(imageFilenameWithPath))
+        parsed.append((login, filename))
+    return parsed
+
 if __name__ == "__main__":
 
     imageFilenameWithPath = sys.argv[1].strip()
@@ -217,38 +259,94 @@ if __name__ == "__main__":
         colors["title-icon"] = topIcon
 
     commit_message = sys.argv[20].strip()
+
+    cacheDirectory = sys.argv[21].strip()
+    if len(cacheDirectory) == 0:
+        cacheDirectory = None
         
-    stats = Statistician(
-        failOnError,
-        autoLanguages,
-        maxLanguages,
-        languageRepoExclusions,
-        featuredRepo
-        )
-    generator = StatsImageGenerator(
-        stats,
-        colors,
-        locale,
-        radius,
-        titleSize,
-        categories,
-        animateLanguageChart,
-        animationSpeed,
-        width,
-        customTitle,
-        includeTitle,
-        exclude
-        )
-    image = generator.generateImage()
-    writeImageToFile(imageFilenameWithPath, image, failOnError)
-
-    if commit:
-        commitAndPush(
-            imageFilenameWithPath,
-            "github-actions",
-            "41898282+github-actions[bot]",
-            failOnError,
-            commit_message)
-    
-    set_outputs({"exit-code" : 0})
+    users = parseUsers(sys.argv[22].strip(), imageFilenameWithPath)
+    if len(users) == 0:
+        users = [(None, imageFilenameWithPath)]
+
+    organization = sys.argv[23].strip()
+    if len(organization) > 0:
+        users = [(organization, imageFilenameWithPath)]
+
+    traceFile = sys.argv[24].strip()
+
+    # All users share the same connections, cache, rate limit budget,
+    # and locale.
+    rateLimiter = RateLimiter()
+    retryPolicy = RetryPolicy()
+    client = GitHubClient.fromEnvironment(rateLimiter, retryPolicy)
+    cache = ResponseCache.fromEnvironment(cacheDirectory) if cacheDirectory != None else None
+    labels = loadLocale(locale)
+    labelWidths = loadLabelWidths(locale)
+    plan = QueryPlan(categories, exclude)
+
+    imageFilenames = []
+    try:
+        for login, filename in users:
+            try:
+                with tracer.span("queries", phase=True, login=login):
+                    stats = Statistician(
+                        failOnError,
+                        autoLanguages,
+                        maxLanguages,
+                        languageRepoExclusions,
+                        featuredRepo,
+                        cacheDirectory,
+                        rateLimiter,
+                        retryPolicy,
+                        login,
+                        client,
+                        cache,
+                        len(organization) > 0,
+                        plan
+                        )
+                with tracer.span("layout", phase=True, login=login):
+                    generator = StatsImageGenerator(
+                        stats,
+                        colors,
+                        locale,
+                        radius,
+                        titleSize,
+                        categories,
+                        animateLanguageChart,
+                        animationSpeed,
+                        width,
+                        customTitle,
+                        includeTitle,
+                        exclude,
+                        labels,
+                        labelWidths
+                        )
+                # The image is written to the file as it is rendered.
+                with tracer.span("render", phase=True, login=login):
+                    writeImageToFile(filename, generator.writeImage, failOnError)
+                imageFilenames.append(filename)
+            except SystemExit as e:
+                # If fail-on-error is false, an error for one user of
+                # a batch skips that user's image rather than the rest.
+                if e.code or len(users) == 1:
+                    raise
+
+        if commit and len(imageFilenames) > 0:
+            with tracer.span("commit", phase=True):
+                commitAndPush(
+                    imageFilenames,
+                    "github-actions",
+                    "41898282+github-actions[bot]",
+                    failOnError,
+                    commit_message)
+    finally:
+        if client != None:
+            client.close()
+        # The timings and trace are written even if the run fails,
+        # which is when they are most needed.
+        set_outputs({"timings" : json.dumps(tracer.totals(), separators=(",", ":"))})
+        if len(traceFile) > 0:
+            tracer.writeTrace(traceFile)
     
+    if len(imageFilenames) == len(users):
+        set_outputs({"exit-code" : 0})
@@ -0,0 +1,641 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""An offline stand-in for GitHub's GraphQL and REST APIs, and a harness
+that runs the complete action (UserStatistician.py) against it, for
+end-to-end tests and benchmarks on a machine with no network access.
+
+The fake API serves a "world" of users and organizations, which can be
+built from recorded query results (see worldFromQueryResults and
+recordWorld), or generated. GraphQL queries are answered by resolving
+their selection sets against the world, so every query of the action,
+including combined, pruned, and paginated queries, gets the same data.
+Latency, page size limits, failures, and rate limits are configurable.
+
+To record a world from the real GitHub API (requires GITHUB_TOKEN):
+    python3 tests/FakeGitHub.py record <login> <filename>
+"""
+
+import copy
+import gzip
+import hashlib
+import json
+import os
+import re
+import runpy
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+_srcDirectory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+_actionFile = os.path.join(os.path.dirname(_srcDirectory), "action.yml")
+
+_tokenPattern = re.compile(r'\s*(\.\.\.|"(?:[^"\\]|\\.)*"|\$?[A-Za-z_][A-Za-z0-9_]*|-?\d+|[{}():,!=\[\]])')
+
+def tokenize(query):
+    """Splits the text of a GraphQL query into a list of tokens.
+
+    Keyword arguments:
+    query - The text of the query.
+    """
+    tokens = []
+    position = 0
+    query = query.rstrip()
+    while position < len(query):
+        match = _tokenPattern.match(query, position)
+        if match == None:
+            raise ValueError("Unexpected character in query: " + query[position:position+20])
+        tokens.append(match.group(1))
+        position = match.end()
+    return tokens
+
+def parseQuery(query):
+    """Parses the text of a GraphQL query into its selection set, a list of
+    fields, each a dictionary with the field's alias, name, arguments
+    (with variables as "$name" strings), and selections (None for leaves).
+
+    Keyword arguments:
+    query - The text of the query.
+    """
+    tokens = tokenize(query)
+    i = 0
+    if tokens[i] == "query":
+        i += 1
+        if tokens[i] not in {"(", "{"}:
+            i += 1
+        if tokens[i] == "(":
+            # Skips the declarations of the variables, whose defaults
+            # are supplied by GitHubClient.
+            depth = 0
+            while True:
+                depth += {"(" : 1, ")" : -1}.get(tokens[i], 0)
+                i += 1
+                if depth == 0:
+                    break
+    selections, i = _parseSelectionSet(tokens, i)
+    return selections
+
+def _parseSelectionSet(tokens, i):
+    """Parses a selection set starting at its opening brace, returning
+    the list of fields and the index after the closing brace.
+
+    Keyword arguments:
+    tokens - The tokens of the query.
+    i - The index of the opening brace.
+    """
+    fields = []
+    i += 1
+    while tokens[i] != "}":
+        name = tokens[i]
+        alias = name
+        i += 1
+        if tokens[i] == ":":
+            name = tokens[i+1]
+            i += 2
+        arguments = {}
+        if tokens[i] == "(":
+            i += 1
+            while tokens[i] != ")":
+                argument = tokens[i]
+                arguments[argument], i = _parseValue(tokens, i + 2)
+                if tokens[i] == ",":
+                    i += 1
+            i += 1
+        selections = None
+        if tokens[i] == "{":
+            selections, i = _parseSelectionSet(tokens, i)
+        fields.append({"alias" : alias, "name" : name, "arguments" : arguments, "selections" : selections})
+    return fields, i + 1
+
+def _parseValue(tokens, i):
+    """Parses an argument's value, returning it and the index after it.
+
+    Keyword arguments:
+    tokens - The tokens of the query.
+    i - The index of the value.
+    """
+    token = tokens[i]
+    if token == "{":
+        value = {}
+        i += 1
+        while tokens[i] != "}":
+            value[tokens[i]], i = _parseValue(tokens, i + 2)
+            if tokens[i] == ",":
+                i += 1
+        return value, i + 1
+    if token == "[":
+        value = []
+        i += 1
+        while tokens[i] != "]":
+            item, i = _parseValue(tokens, i)
+            value.append(item)
+            if tokens[i] == ",":
+                i += 1
+        return value, i + 1
+    if token.startswith('"'):
+        return json.loads(token), i + 1
+    if re.fullmatch(r"-?\d+", token):
+        return int(token), i + 1
+    return {"true" : True, "false" : False, "null" : None}.get(token, token), i + 1
+
+class FakeGitHub:
+    """A local HTTP server that stands in for GitHub's GraphQL and REST
+    APIs, serving a world of users and organizations.
+
+    The world is a dictionary with "users" and "organizations", each mapping
+    logins to objects with the fields of GitHub's schema that the action
+    queries. A user or organization's "repositories" is a list of repository
+    nodes, which is paginated. A user's "contributionsByYear" maps years (as
+    strings) to the contributionsCollection of each year, and its
+    "totalCommits" and "totalReviews" are the counts of the search API.
+    """
+
+    __slots__ = [
+        'world',
+        'latency',
+        'maxPageSize',
+        'rateLimit',
+        'rateLimitRemaining',
+        'requests',
+        '_failures',
+        '_lock',
+        '_server',
+        '_thread'
+        ]
+
+    def __init__(self, world, latency=0, maxPageSize=None, rateLimit=5000):
+        """Initializes the fake API.
+
+        Keyword arguments:
+        world - The world of users and organizations.
+        latency - The number of seconds to delay each response.
+        maxPageSize - If not None, the largest page of repositories that
+            can be served, beyond which a query fails with a resource
+            limits error.
+        rateLimit - The rate limit of the GraphQL API, in points per hour.
+        """
+        self.world = world
+        self.latency = latency
+        self.maxPageSize = maxPageSize
+        self.rateLimit = rateLimit
+        self.rateLimitRemaining = rateLimit
+        self.requests = []
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.stop()
+
+    def start(self):
+        """Starts serving on a free local port."""
+        fake = self
+        class Handler(_FakeGitHubHandler):
+            fakeGitHub = fake
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def url(self):
+        """Gets the base url of the fake API, for GITHUB_API_URL."""
+        return "http://127.0.0.1:{0}".format(self._server.server_address[1])
+
+    def environment(self):
+        """Gets the environment variables that direct the action to the fake API."""
+        return {
+            "GITHUB_TOKEN" : "fake-token",
+            "GITHUB_API_URL" : self.url(),
+            "GITHUB_GRAPHQL_URL" : self.url() + "/graphql"
+            }
+
+    def injectFailures(self, *failures):
+        """Fails the next requests, one per failure, in order. Each failure
+        is an HTTP status, such as 502, where 403 and 429 fail as secondary
+        rate limits, or a GraphQL error type, such as "TIMEOUT".
+
+        Keyword arguments:
+        failures - The failures to inject.
+        """
+        with self._lock:
+            self._failures.extend(failures)
+
+    def nextFailure(self):
+        """Gets the next injected failure, or None if there isn't one."""
+        with self._lock:
+            return self._failures.pop(0) if len(self._failures) > 0 else None
+
+    def record(self, method, path, status):
+        """Records a request in the log of requests.
+
+        Keyword arguments:
+        method - The HTTP method.
+        path - The path of the request, or for GraphQL, a summary of the query.
+        status - The status of the response.
+        """
+        with self._lock:
+            self.requests.append((method, path, status))
+
+    def graphqlRequests(self):
+        """Gets the number of GraphQL requests served."""
+        return sum(1 for method, path, status in self.requests if method == "POST")
+
+    def consumeRateLimit(self, cost):
+        """Deducts the cost of a query from the GraphQL rate limit, and
+        returns the rateLimit object of the query's response.
+
+        Keyword arguments:
+        cost - The cost of the query.
+        """
+        with self._lock:
+            self.rateLimitRemaining = max(0, self.rateLimitRemaining - cost)
+            return {
+                "cost" : cost,
+                "remaining" : self.rateLimitRemaining,
+                "resetAt" : time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 3600))
+                }
+
+    def executeGraphQL(self, query, variables):
+        """Executes a GraphQL query against the world, returning the
+        response's status and payload.
+
+        Keyword arguments:
+        query - The text of the query.
+        variables - A dictionary of the query's variables.
+        """
+        variables = dict(variables)
+        variables.setdefault("pageSize", 100)
+        resolver = _Resolver(self, variables)
+        data = resolver.resolveSelections(parseQuery(query), None)
+        if resolver.tooExpensive:
+            return 200, {"data" : None, "errors" : [{
+                "type" : "RESOURCE_LIMITS_EXCEEDED",
+                "message" : "Resource limits for this query exceeded."}]}
+        response = {"data" : data}
+        if len(resolver.errors) > 0:
+            response["errors"] = resolver.errors
+        return 200, response
+
+    def executeSearch(self, path, parameters):
+        """Executes a search of the REST API against the world, returning
+        the response's status and payload.
+
+        Keyword arguments:
+        path - The path of the request, such as /search/commits.
+        parameters - The dictionary of the query string's parameters.
+        """
+        terms = dict(
+            term.split(":", 1) for term in parameters.get("q", [""])[0].split() if ":" in term)
+        if path == "/search/commits":
+            user = self.world.get("users", {}).get(terms.get("author"))
+            field = "totalCommits"
+        elif path == "/search/issues":
+            user = self.world.get("users", {}).get(terms.get("reviewed-by"))
+            field = "totalReviews"
+        else:
+            return 404, {"message" : "Not Found"}
+        if user == None:
+            return 422, {"message" : "Validation Failed"}
+        return 200, {"total_count" : user.get(field, 0), "incomplete_results" : False, "items" : []}
+
+class _Resolver:
+    """Resolves the selection set of a query against a FakeGitHub's world."""
+
+    __slots__ = [
+        '_fake',
+        '_variables',
+        'errors',
+        'tooExpensive'
+        ]
+
+    def __init__(self, fake, variables):
+        self._fake = fake
+        self._variables = variables
+        self.errors = []
+        self.tooExpensive = False
+
+    def argument(self, field, name, default=None):
+        """Gets the value of an argument, substituting variables."""
+        value = field["arguments"].get(name, default)
+        if isinstance(value, str) and value.startswith("$"):
+            return self._variables.get(value[1:], default)
+        return value
+
+    def resolveSelections(self, selections, parent):
+        """Resolves a list of fields against a parent object."""
+        result = {}
+        for field in selections:
+            result[field["alias"]] = self.project(self.resolveField(field, parent), field)
+        return result
+
+    def project(self, value, field):
+        """Projects a resolved value onto a field's selections."""
+        if field["selections"] == None or value == None:
+            return value
+        if isinstance(value, list):
+            return [self.resolveSelections(field["selections"], item) for item in value]
+        return self.resolveSelections(field["selections"], value)
+
+    def resolveField(self, field, parent):
+        """Resolves the value of one field of a parent object."""
+        name = field["name"]
+        if parent == None:
+            if name == "rateLimit":
+                return self._fake.consumeRateLimit(1)
+            if name in {"user", "organization"}:
+                login = self.argument(field, "login")
+                owner = self._fake.world.get(name + "s", {}).get(login)
+                if owner == None:
+                    self.errors.append({
+                        "type" : "NOT_FOUND",
+                        "path" : [field["alias"]],
+                        "message" : "Could not resolve to a {0} with the login of '{1}'.".format(
+                            name.capitalize(), login)})
+                return owner
+            return None
+        if name == "repositories" and isinstance(parent.get("repositories"), list):
+            return self.paginate(field, parent["repositories"])
+        if name == "contributionsCollection":
+            start = self.argument(field, "from")
+            if start != None:
+                return parent.get("contributionsByYear", {}).get(start[:4])
+            return parent.get("contributionsCollection")
+        if name == "languages" and isinstance(parent.get("languages"), dict):
+            languages = dict(parent["languages"])
+            languages["edges"] = languages.get("edges", [])[:self.argument(field, "first", 100)]
+            return languages
+        return parent.get(name)
+
+    def paginate(self, field, repositories):
+        """Resolves one page of a repositories connection."""
+        first = self.argument(field, "first", 100)
+        if self._fake.maxPageSize != None and first > self._fake.maxPageSize:
+            self.tooExpensive = True
+        orderBy = self.argument(field, "orderBy")
+        if isinstance(orderBy, dict) and orderBy.get("field") == "UPDATED_AT":
+            repositories = sorted(
+                repositories,
+                key=lambda repo : repo.get("updatedAt") or "",
+                reverse=orderBy.get("direction") == "DESC")
+        after = self.argument(field, "after")
+        start = 0 if after == None else int(after)
+        end = min(start + first, len(repositories))
+        return {
+            "totalCount" : len(repositories),
+            "nodes" : repositories[start:end],
+            "pageInfo" : {"hasNextPage" : end < len(repositories), "endCursor" : str(end)}
+            }
+
+class _FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Serves the requests of a FakeGitHub."""
+
+    protocol_version = "HTTP/1.1"
+    fakeGitHub = None
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        fake = self.fakeGitHub
+        time.sleep(fake.latency)
+        failure = fake.nextFailure()
+        if failure != None:
+            self._fail(failure, "POST")
+            return
+        status, payload = fake.executeGraphQL(request["query"], request.get("variables", {}))
+        fake.record("POST", "graphql", status)
+        self._respond(payload, status)
+
+    def do_GET(self):
+        fake = self.fakeGitHub
+        time.sleep(fake.latency)
+        failure = fake.nextFailure()
+        if failure != None:
+            self._fail(failure, "GET")
+            return
+        url = urlsplit(self.path)
+        status, payload = fake.executeSearch(url.path, parse_qs(url.query))
+        body = json.dumps(payload)
+        etag = '"{0}"'.format(hashlib.sha256(body.encode("utf-8")).hexdigest()[:16])
+        headers = {
+            "ETag" : etag,
+            "x-ratelimit-limit" : "30",
+            "x-ratelimit-remaining" : "29",
+            "x-ratelimit-reset" : str(int(time.time()) + 60)
+            }
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            fake.record("GET", url.path, 304)
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        fake.record("GET", url.path, status)
+        self._respond(payload, status, headers)
+
+    def _fail(self, failure, method):
+        """Responds with an injected failure."""
+        self.fakeGitHub.record(method, "failure", failure)
+        if isinstance(failure, str):
+            self._respond({"data" : None, "errors" : [{"type" : failure, "message" : failure}]})
+        elif failure in {403, 429}:
+            self._respond(
+                {"message" : "You have exceeded a secondary rate limit."},
+                failure,
+                {"Retry-After" : "0"})
+        else:
+            self._respond({"message" : "Server Error"}, failure)
+
+    def _respond(self, payload, status=200, headers={}):
+        body = gzip.compress(json.dumps(payload).encode("utf-8"))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def worldFromQueryResults(
+        basicStats,
+        contributionStats,
+        repoStats,
+        contribToData=None,
+        yearlyQueryResults={},
+        totalCommits=0,
+        totalReviews=0):
+    """Builds a world with one user from the results of the action's queries.
+
+    Keyword arguments:
+    basicStats - The results of the basic stats query.
+    contributionStats - The results of the contributions query.
+    repoStats - The list of the pages of the results of the repo stats query.
+    contribToData - The results of the repositories contributed to query, or None.
+    yearlyQueryResults - A dictionary mapping years to the results of the
+        query of one year of contributions.
+    totalCommits - The total count of the search for commits.
+    totalReviews - The total count of the search for pull request reviews.
+    """
+    user = copy.deepcopy(basicStats["data"]["user"])
+    user.update(copy.deepcopy(contributionStats["data"]["user"]))
+    user["repositoriesContributedTo"] = copy.deepcopy(
+        contribToData["data"]["user"]["repositoriesContributedTo"]) if contribToData != None else {"totalCount" : 0}
+    user["repositories"] = [
+        copy.deepcopy(repo) for page in repoStats
+        for repo in page["data"]["user"]["repositories"]["nodes"] ]
+    user["contributionsByYear"] = {
+        str(year) : copy.deepcopy(result["data"]["user"]["contributionsCollection"])
+        for year, result in yearlyQueryResults.items() }
+    user["totalCommits"] = totalCommits
+    user["totalReviews"] = totalReviews
+    return {"users" : {user["login"] : user}, "organizations" : {}}
+
+def recordWorld(client, login):
+    """Records a world with one user by executing the action's queries
+    against the real GitHub API.
+
+    Keyword arguments:
+    client - A GitHubClient.
+    login - The user's login.
+    """
+    def load(name):
+        with open(os.path.join(_srcDirectory, "queries", name + ".graphql"), "r") as f:
+            return f.read()
+    variables = {"owner" : login}
+    contributionStats = client.graphql(load("contributions"), variables)
+    years = contributionStats["data"]["user"]["contributionsCollection"].get("contributionYears", [])
+    return worldFromQueryResults(
+        client.graphql(load("basicstats"), variables),
+        contributionStats,
+        client.graphql(load("repostats"), variables, True),
+        client.graphql(load("basicstats2"), variables),
+        { year : client.graphql(load("oneYear").replace("{YEAR}", str(year)), variables) for year in years },
+        client.rest("search/commits", {"q" : "author:" + login})["total_count"],
+        client.rest("search/issues", {"q" : "is:pr reviewed-by:" + login})["total_count"])
+
+def actionInputs():
+    """Gets the names of the action's inputs in the order of the action's
+    arguments, and a dictionary of their default values, from action.yml.
+    """
+    with open(_actionFile, "r") as f:
+        text = f.read()
+    names = re.findall(r"\$\{\{ inputs\.([a-z-]+) \}\}", text)
+    defaults = {}
+    for name, value in re.findall(r"\n  ([a-z-]+):\s*\n(?:    .*\n)*?    default: (.*)", text):
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+            value = value[1:-1]
+        defaults[name] = value
+    return names, defaults
+
+def runAction(inputs={}, environment={}, workingDirectory=None):
+    """Runs the complete action (UserStatistician.py) in this process, as
+    its container would, except that the queries and locales are loaded
+    from the src directory. Returns the exit code and a dictionary of the
+    action's outputs.
+
+    Keyword arguments:
+    inputs - A dictionary of the inputs that differ from their defaults.
+    environment - A dictionary of environment variables to set, such as
+        those of FakeGitHub.environment().
+    workingDirectory - The directory in which to run, which is the
+        repository in which images are written and committed, or None for
+        the current directory.
+    """
+    if _srcDirectory not in sys.path:
+        sys.path.insert(0, _srcDirectory)
+    import StatConfig
+    from Statistician import Statistician
+    names, defaults = actionInputs()
+    arguments = [os.path.join(_srcDirectory, "UserStatistician.py")] + [
+        str(inputs.get(name, defaults.get(name, ""))) for name in names ]
+    loadQuery = Statistician.loadQuery
+    localeDirectory = StatConfig._locale_directory
+    savedArguments = sys.argv
+    savedEnvironment = dict(os.environ)
+    savedDirectory = os.getcwd()
+    savedUmask = os.umask(0)
+    os.umask(savedUmask)
+    with tempfile.TemporaryDirectory() as outputDirectory:
+        outputFile = os.path.join(outputDirectory, "output")
+        open(outputFile, "w").close()
+        try:
+            Statistician.loadQuery = lambda self, queryFilepath, failOnError=True : loadQuery(
+                self, _srcDirectory + queryFilepath, failOnError)
+            StatConfig._locale_directory = _srcDirectory + "/locales/"
+            sys.argv = arguments
+            os.environ.update(environment)
+            os.environ["GITHUB_OUTPUT"] = outputFile
+            if workingDirectory != None:
+                os.chdir(workingDirectory)
+            try:
+                runpy.run_path(arguments[0], run_name="__main__")
+                exitCode = 0
+            except SystemExit as e:
+                exitCode = e.code if isinstance(e.code, int) else (0 if e.code == None else 1)
+        finally:
+            Statistician.loadQuery = loadQuery
+            StatConfig._locale_directory = localeDirectory
+            sys.argv = savedArguments
+            os.environ.clear()
+            os.environ.update(savedEnvironment)
+            os.chdir(savedDirectory)
+            os.umask(savedUmask)
+        outputs = {}
+        with open(outputFile, "r") as f:
+            for line in f:
+                name, separator, value = line.rstrip("\n").partition("=")
+                outputs[name] = value
+    return exitCode, outputs
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "record":
+        sys.path.insert(0, _srcDirectory)
+        from GitHubClient import GitHubClient
+        client = GitHubClient.fromEnvironment()
+        if client == None:
+            print("Recording requires GITHUB_TOKEN.")
+            exit(1)
+        with open(sys.argv[3], "w") as f:
+            json.dump(recordWorld(client, sys.argv[2]), f, indent=1)
+    else:
+        print("Usage: python3 tests/FakeGitHub.py record <login> <filename>")
@@ -0,0 +1,327 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""Benchmarks of parsing the query results, summarizing the languages,
+laying out and generating the image, and measuring text, on synthetic
+users with up to 50,000 repositories and 500 languages, in all locales
+and themes. Records the time and the peak memory of each benchmark,
+and optionally compares them to the results of a previous run.
+
+Usage:
+    python3 tests/benchmarks.py [--quick] [--output results.json]
+        [--baseline baseline.json] [--tolerance 1.25]
+
+Exits with a nonzero status if any benchmark is slower than the
+baseline by more than the tolerance factor, or uses more than the
+tolerance factor times the baseline's peak memory.
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import StatConfig
+from StatConfig import supportedLocales, categoryOrder, loadLocale
+from Statistician import Statistician
+from StatsImageGenerator import StatsImageGenerator
+from Colors import colorMapping
+from PieChart import svgPieChart
+from TextLength import calculateTextLength110, calculateTextLengths110
+
+StatConfig._locale_directory = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "locales") + "/"
+
+def syntheticQueryResults(numRepos, numLanguages, seed=42):
+    """Generates the results of the basic stats, contributions, repo stats,
+    and repositories contributed to queries of a synthetic user, in the
+    format returned by the GitHub API.
+
+    Keyword arguments:
+    numRepos - The number of repositories.
+    numLanguages - The number of distinct languages across the repositories.
+    seed - The seed of the random number generator.
+    """
+    rng = random.Random(seed)
+    languages = [
+        {"name" : "Language{0}".format(i), "color" : "#{0:06x}".format(rng.randrange(1 << 24))}
+        for i in range(numLanguages) ]
+    basicStats = {"data" : {"user" : {
+        "login" : "someuser",
+        "name" : "Firstname M. Lastname",
+        "createdAt" : "2011-05-01T15:46:30Z",
+        "followers" : {"totalCount" : rng.randrange(10000)},
+        "following" : {"totalCount" : rng.randrange(1000)},
+        "issues" : {"totalCount" : rng.randrange(10000)},
+        "pullRequests" : {"totalCount" : rng.randrange(10000)},
+        "sponsorshipsAsMaintainer" : {"totalCount" : rng.randrange(100)},
+        "sponsorshipsAsSponsor" : {"totalCount" : rng.randrange(100)}
+        }}}
+    contributionStats = {"data" : {"user" : {"contributionsCollection" : {
+        "totalCommitContributions" : rng.randrange(10000),
+        "totalIssueContributions" : rng.randrange(1000),
+        "totalPullRequestContributions" : rng.randrange(1000),
+        "totalPullRequestReviewContributions" : rng.randrange(1000),
+        "restrictedContributionsCount" : rng.randrange(1000),
+        "contributionYears" : list(range(2026, 2010, -1))
+        }}}}
+    contribToData = {"data" : {"user" : {"repositoriesContributedTo" : {"totalCount" : rng.randrange(100)}}}}
+    repos = []
+    for i in range(numRepos):
+        # Every language appears in at least one repository.
+        repoLanguages = [languages[i % numLanguages]] + rng.sample(languages, min(5, numLanguages) - 1)
+        sizes = sorted((rng.randrange(1, 1000000) for L in repoLanguages), reverse=True)
+        repos.append({
+            "stargazerCount" : rng.randrange(100),
+            "forkCount" : rng.randrange(50),
+            "isArchived" : rng.random() < 0.1,
+            "isFork" : rng.random() < 0.2,
+            "isPrivate" : rng.random() < 0.1,
+            "isTemplate" : rng.random() < 0.05,
+            "name" : "repo{0}".format(i),
+            "updatedAt" : "2026-01-01T00:00:00Z",
+            "pushedAt" : "2026-01-01T00:00:00Z",
+            "watchers" : {"totalCount" : rng.randrange(100)},
+            "languages" : {
+                "totalCount" : len(repoLanguages),
+                "totalSize" : sum(sizes),
+                "edges" : [
+                    {"size" : size, "node" : {"color" : L["color"], "name" : L["name"]}}
+                    for size, L in zip(sizes, repoLanguages) ]
+                }
+            })
+    repoStats = [
+        {"data" : {"user" : {"repositories" : {
+            "totalCount" : numRepos,
+            "nodes" : repos[start:start+100],
+            "pageInfo" : {"hasNextPage" : start + 100 < numRepos, "endCursor" : str(start + 100)}
+            }}}}
+        for start in range(0, max(numRepos, 1), 100) ]
+    return basicStats, contributionStats, repoStats, contribToData
+
+class BenchmarkStatistician(Statistician):
+    """A Statistician that doesn't execute any queries."""
+
+    def __init__(self, autoLanguages=True, maxLanguages=1000):
+        self._autoLanguages = autoLanguages
+        self._maxLanguages = maxLanguages
+        self._languageRepoExclusions = set()
+        self._featuredRepo = None
+
+def parsedStatistician(queryResults):
+    """Creates a BenchmarkStatistician that has parsed query results.
+
+    Keyword arguments:
+    queryResults - A tuple of the results of syntheticQueryResults.
+    """
+    basicStats, contributionStats, repoStats, contribToData = copy.deepcopy(queryResults)
+    stats = BenchmarkStatistician()
+    stats.parseStats(basicStats, contributionStats, repoStats, contribToData=contribToData)
+    return stats
+
+def localeStrings():
+    """Gets all of the labels of all of the locales."""
+    strings = []
+    for locale in sorted(supportedLocales):
+        labels = loadLocale(locale)
+        strings.append(labels["titleTemplate"])
+        strings.extend(labels["statLabels"].values())
+        for category in labels["categoryLabels"].values():
+            strings.extend(s for s in category.values() if s != None)
+    return strings
+
+def measure(function, repeat, minTime=0.05):
+    """Times a function, returning a dictionary with the minimum and
+    median seconds per call over repeated trials, and the peak memory
+    allocated during one additional call. Each trial calls the function
+    enough times to last at least minTime seconds.
+
+    Keyword arguments:
+    function - A function of no arguments.
+    repeat - The number of trials.
+    minTime - The minimum duration of a trial, in seconds.
+    """
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for i in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= minTime or calls >= 1 << 20:
+            break
+        calls *= 2
+    trials = [elapsed / calls]
+    for r in range(repeat - 1):
+        start = time.perf_counter()
+        for i in range(calls):
+            function()
+        trials.append((time.perf_counter() - start) / calls)
+    tracemalloc.start()
+    function()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds" : min(trials),
+        "median" : statistics.median(trials),
+        "calls" : calls,
+        "peakBytes" : peak
+        }
+
+def benchmarks(quick=False):
+    """Yields the name and function of each benchmark.
+
+    Keyword arguments:
+    quick - If True, skips the largest scales.
+    """
+    scales = [(10, 1), (10, 10), (1000, 10), (1000, 100), (1000, 500)]
+    if not quick:
+        scales += [(50000, 100), (50000, 500)]
+    for numRepos, numLanguages in scales:
+        queryResults = syntheticQueryResults(numRepos, numLanguages)
+        basicStats, contributionStats, repoStats, contribToData = queryResults
+        suffix = "/repos={0}/languages={1}".format(numRepos, numLanguages)
+        def parseStats(queryResults=queryResults):
+            # parseStats modifies the results of the small queries, so they
+            # are copied, but the pages of repositories are only read.
+            basicStats, contributionStats, repoStats, contribToData = queryResults
+            stats = BenchmarkStatistician()
+            stats.parseStats(
+                copy.deepcopy(basicStats),
+                copy.deepcopy(contributionStats),
+                repoStats,
+                contribToData=contribToData)
+        yield "parseStats" + suffix, parseStats
+        connections = [page["data"]["user"]["repositories"] for page in repoStats]
+        def languageStats(connections=connections):
+            stats = BenchmarkStatistician()
+            totalSize, languageData = stats.summarizeLanguageStats(connections)
+            stats.organizeLanguageStats(totalSize, languageData)
+        yield "summarizeLanguageStats+organizeLanguageStats" + suffix, languageStats
+        stats = parsedStatistician(queryResults)
+        def layout(stats=stats):
+            StatsImageGenerator(
+                stats, copy.deepcopy(colorMapping["light"]), "en", 6, 18,
+                categoryOrder, False, 10, 0, None, True, set()).calculateMinimumFeasibleWidth()
+        yield "calculateMinimumFeasibleWidth" + suffix, layout
+        def generate(stats=stats):
+            StatsImageGenerator(
+                stats, copy.deepcopy(colorMapping["light"]), "en", 6, 18,
+                categoryOrder, True, 10, 0, None, True, set()).generateImage()
+        yield "generateImage" + suffix, generate
+    stats = parsedStatistician(syntheticQueryResults(1000, 10))
+    for locale in sorted(supportedLocales):
+        def generate(locale=locale):
+            StatsImageGenerator(
+                stats, copy.deepcopy(colorMapping["light"]), locale, 6, 18,
+                categoryOrder, False, 10, 0, None, True, set()).generateImage()
+        yield "generateImage/locale={0}".format(locale), generate
+    for theme in sorted(colorMapping):
+        def generate(theme=theme):
+            StatsImageGenerator(
+                stats, copy.deepcopy(colorMapping[theme]), "en", 6, 18,
+                categoryOrder, False, 10, 0, None, True, set()).generateImage()
+        yield "generateImage/theme={0}".format(theme), generate
+    for numWedges in [1, 10, 100, 500]:
+        wedges = [
+            {"color" : "#000000", "percentage" : 1 / numWedges}
+            for i in range(numWedges) ]
+        def pieChart(wedges=wedges):
+            svgPieChart(copy.copy(wedges), 100, True, 10)
+        yield "svgPieChart/wedges={0}".format(numWedges), pieChart
+    strings = localeStrings()
+    def measureLocales(strings=strings):
+        for s in strings:
+            calculateTextLength110(s)
+    yield "calculateTextLength110/locale-labels", measureLocales
+    # Without the memoization of the lengths.
+    def measureLocalesUncached(strings=strings):
+        for s in strings:
+            calculateTextLength110.__wrapped__(s)
+    yield "calculateTextLength110/locale-labels/uncached", measureLocalesUncached
+    def measureLocalesBatch(strings=strings):
+        calculateTextLengths110(strings)
+    yield "calculateTextLengths110/locale-labels", measureLocalesBatch
+    rng = random.Random(42)
+    long = "".join(chr(rng.randrange(32, 127)) for i in range(10000))
+    def measureLong(s=long):
+        calculateTextLength110.__wrapped__(s)
+    yield "calculateTextLength110/ascii-10000/uncached", measureLong
+
+def compare(results, baseline, tolerance):
+    """Compares the results to a baseline, returning a list of the
+    descriptions of the regressions.
+
+    Keyword arguments:
+    results - The results of this run.
+    baseline - The results of a previous run.
+    tolerance - The factor by which a benchmark may exceed the baseline.
+    """
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+        previous = baseline["benchmarks"][name]
+        for field in ["seconds", "peakBytes"]:
+            if previous[field] > 0 and result[field] > tolerance * previous[field]:
+                regressions.append("{0}: {1} {2:.3g} vs baseline {3:.3g} ({4:.2f}x)".format(
+                    name, field, result[field], previous[field], result[field] / previous[field]))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of user-statistician.")
+    parser.add_argument("--quick", action="store_true", help="skip the largest scales")
+    parser.add_argument("--repeat", type=int, default=5, help="number of trials of each benchmark")
+    parser.add_argument("--output", default="benchmark-results.json", help="file for the results")
+    parser.add_argument("--baseline", help="results of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown factor")
+    arguments = parser.parse_args()
+    results = {
+        "python" : platform.python_version(),
+        "platform" : platform.platform(),
+        "benchmarks" : {}
+        }
+    for name, function in benchmarks(arguments.quick):
+        result = measure(function, arguments.repeat)
+        results["benchmarks"][name] = result
+        print("{0:<70} {1:>12.6f} s {2:>12,} bytes".format(name, result["seconds"], result["peakBytes"]))
+    with open(arguments.output, "w") as f:
+        json.dump(results, f, indent=2)
+    if arguments.baseline != None:
+        with open(arguments.baseline, "r") as f:
+            regressions = compare(results, json.load(f), arguments.tolerance)
+        for regression in regressions:
+            print("REGRESSION: " + regression)
+        if len(regressions) > 0:
+            exit(1)
@@ -1,7 +1,7 @@
 #
 # user-statistician: Github action for generating a user stats card
 # 
-# Copyright (c) 2021-2022 Vincent A Cicirello
+# Copyright (c) 2021-2026 Vincent A Cicirello
 # https://www.cicirello.org/
 #
 # MIT License
@@ -26,21 +26,17 @@
 #
 
 import json
-import pprint
+import sys
+
+sys.path.insert(0, "../src")
+
+from TextLength import packWidths
 
 if __name__ == "__main__" :
+    # Packs the glyph widths of default-widths.json (from
+    # https://github.com/google/pybadges, which is licensed under
+    # Apache-2.0) into the compact binary format loaded by TextLength.
     with open("default-widths.json", "r") as f :
         defaultWidths = json.load(f)
-    with open("default-widths.py", "wb") as f :
-        heading = """########################################
-# The dict that follows is derived from
-# default-widths.json from
-# https://github.com/google/pybadges,
-# which is licensed under Apache-2.0.
-########################################
-"""
-        formatted = pprint.pformat(defaultWidths, indent=0, compact=True)
-        formatted = formatted.replace(" " * 21, "")
-        formatted = formatted.replace(" " * 17, "")
-        s = heading + "\ndefaultWidths = " + formatted
-        f.write(s.encode(encoding="UTF-8"))
+    with open("../src/default-widths.bin", "wb") as f :
+        f.write(packWidths(defaultWidths))
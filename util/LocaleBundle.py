@@ -0,0 +1,56 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+import sys
+
+sys.path.insert(0, "../src")
+
+import StatConfig
+from StatConfig import supportedLocales, validateLocale
+
+StatConfig._locale_directory = "../src/locales/"
+
+if __name__ == "__main__" :
+    # Validates all of the locales, and combines them into the bundle
+    # from which the action loads them. Rerun whenever a locale changes.
+    bundle = {}
+    failed = False
+    for locale in sorted(supportedLocales) :
+        with open(StatConfig._locale_directory + locale + ".json", "r", encoding="utf8") as f :
+            labels = json.load(f)
+        try :
+            validateLocale(labels)
+        except ValueError as e :
+            print("Locale", locale, "is invalid:", e)
+            failed = True
+        bundle[locale] = labels
+    if failed :
+        exit(1)
+    with open(StatConfig._locale_directory + StatConfig._locale_bundle_file, "w", encoding="utf8") as f :
+        json.dump(bundle, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        f.write("\n")
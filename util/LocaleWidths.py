@@ -0,0 +1,53 @@
+#
+# user-statistician: Github action for generating a user stats card
+# 
+# Copyright (c) 2021-2026 Vincent A Cicirello
+# https://www.cicirello.org/
+#
+# MIT License
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+import sys
+
+sys.path.insert(0, "../src")
+
+import StatConfig
+from StatConfig import supportedLocales, loadLocale
+from TextLength import calculateTextLength110
+
+StatConfig._locale_directory = "../src/locales/"
+
+if __name__ == "__main__" :
+    # Precomputes the lengths, in DejaVu Sans 110pt font, of the
+    # category headings, column headings, and stat labels of all of
+    # the locales, which StatsImageGenerator looks up rather than
+    # measuring them on every run. Rerun whenever a locale changes.
+    widths = {}
+    for locale in sorted(supportedLocales) :
+        labels = loadLocale(locale)
+        strings = list(labels["statLabels"].values())
+        for category in labels["categoryLabels"].values() :
+            strings.extend(s for s in category.values() if s != None)
+        widths[locale] = { s : calculateTextLength110(s) for s in strings }
+    with open(StatConfig._locale_directory + StatConfig._label_widths_file, "w", encoding="utf8") as f :
+        json.dump(widths, f, ensure_ascii=False, indent=1, sort_keys=True)
+        f.write("\n")